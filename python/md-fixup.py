@@ -38,19 +38,50 @@ Table cleanup script: Dr. Drang <https://leancrew.com/>
 import re
 import sys
 import argparse
+import bisect
+import functools
+import hashlib
+import io
 import os
+from collections import Counter
 from pathlib import Path
+from types import MappingProxyType
 
-try:
-    import yaml
-except ImportError:
-    yaml = None
+@functools.lru_cache(maxsize=None)
+def _yaml_module():
+    """Import PyYAML on first use (only config handling needs it)
+
+    Returns the yaml module, or None if it isn't installed.
+    """
+    try:
+        import yaml
+    except ImportError:
+        return None
+    return yaml
+
+def _yaml_safe_loader(yaml):
+    """Return PyYAML's safe loader, preferring the libyaml-backed C version"""
+    return getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+@functools.lru_cache(maxsize=None)
+def _rapidfuzz_modules():
+    """Import rapidfuzz on first use (only emoji typo correction needs it)
+
+    Returns (process, Levenshtein), or None if it isn't installed.
+    """
+    try:
+        from rapidfuzz import process
+        from rapidfuzz.distance import Levenshtein
+    except ImportError:
+        return None
+    return process, Levenshtein
 
 VERSION = "0.1.28"
 DEFAULT_WRAP_WIDTH = 60
 
-# Valid GitHub emoji names (normalized: lowercase, hyphens to underscores, sorted, deduplicated)
-VALID_EMOJI_NAMES = [
+# Valid GitHub emoji names (normalized: lowercase, hyphens to underscores, sorted, deduplicated).
+# Stored as a tuple: one contiguous, immutable array of pointers rather than a growable list.
+VALID_EMOJI_NAMES = (
     "+1",
     "100",
     "1234",
@@ -922,32 +953,138 @@ VALID_EMOJI_NAMES = [
     "zap",
     "zero",
     "zzz",
-]
+)
+
+# Intern names so lookups and comparisons can short-circuit on identity
+VALID_EMOJI_NAMES = tuple(sys.intern(name) for name in VALID_EMOJI_NAMES)
 
 # Create set for fast lookup
-VALID_EMOJI_NAMES_SET = set(VALID_EMOJI_NAMES)
+VALID_EMOJI_NAMES_SET = frozenset(VALID_EMOJI_NAMES)
+
+# Bucket emoji names by length: a name whose length differs from the query by more
+# than max_distance can never be within max_distance edits, so fuzzy search skips it
+_EMOJI_NAMES_BY_LEN = {}
+for _emoji_name in VALID_EMOJI_NAMES:
+    _EMOJI_NAMES_BY_LEN.setdefault(len(_emoji_name), []).append(_emoji_name)
+_EMOJI_NAMES_BY_LEN = {length: tuple(names) for length, names in _EMOJI_NAMES_BY_LEN.items()}
+
+def _trigram_counts(text):
+    """Count the (overlapping) 3-grams of text"""
+    return Counter(text[i:i + 3] for i in range(len(text) - 2))
+
+# Inverted trigram index: trigram -> [(emoji_name, occurrences in name), ...]
+_EMOJI_TRIGRAM_INDEX = {}
+for _emoji_name in VALID_EMOJI_NAMES:
+    for _trigram, _count in _trigram_counts(_emoji_name).items():
+        _EMOJI_TRIGRAM_INDEX.setdefault(_trigram, []).append((_emoji_name, _count))
+del _emoji_name, _trigram, _count
+
+# Precompiled regex patterns for per-line helpers
+_RE_ORDERED_ITEM = re.compile(r'^\d+\.\s')
+_RE_HEADLINE_SPACING = re.compile(r'^(#+)(\s*)(.*)$')
+_RE_CODE_SPAN = re.compile(r'`+[^`]*`+')
+_RE_IAL = re.compile(r'(\{:?\s*)([^}]*?)(\s*\})')
+_RE_LIQUID = re.compile(r'(\{%-?)(.*?)(-?%\})')
+_RE_FENCE_LANG = re.compile(r'^(```|~~~)\s+([^\s`~]+)')
+_RE_REF_LINK = re.compile(r'^(\[[^\]]+\])\s*:\s*')
+_RE_TASK = re.compile(r'^(\s*[-*+])\s+(\[[Xx]\])\s+')
+_RE_BLOCKQUOTE = re.compile(r'^(\s*)>([^\s>])')
+_RE_DISPLAY_MATH = re.compile(r'\$\$([\s\S]*?)\$\$', re.DOTALL)
+# Greedy body: it cannot contain $, so it stops at the next $ without lazy stepping
+_RE_INLINE_MATH = re.compile(r'\$([^$]+)\$')
+_RE_CURRENCY = re.compile(r'^[\d.,\s]+$')
+_RE_EMOJI = re.compile(r':([a-zA-Z0-9_+-]+):')
+
+# Precompiled regex patterns for emphasis, list, and wrapping helpers
+# Code spans and emoji markers in one alternation, so a single scan yields ordered regions
+_RE_EMPHASIS_PROTECT = re.compile(r'`+[^`]*`+|:[a-z0-9_+-]+:')
+_RE_BARE_LIST_MARKER = re.compile(r'^([-*+]|\d+\.)')
+_RE_NUMBERED_MARKER = re.compile(r'^\d+\.')
+_RE_LEADING_WS = re.compile(r'^(\s*)')
+_RE_REF_DEF_LINE = re.compile(r'^\[[^\]]+\]\s*:\s*\S+')
+_RE_LONG_LINK = re.compile(r'\[.*?\]\([^)]{20,}\)')
+_RE_LONG_CODE_SPAN = re.compile(r'`[^`]{20,}`')
+
+# Precompiled regex patterns for link conversion
+# Reference definition: [id]: url or [id]: url "title"
+_RE_LINK_REF_DEF = re.compile(r'^(\[[^\]]+\])\s*:\s*(.+)$')
+# Inline link: [text](url) or [text](url "title")
+_RE_INLINE_LINK = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+# Implicit reference link: [text] not followed by [ or (
+_RE_IMPLICIT_LINK = re.compile(r'\[([^\]]+)\](?![\[\(])')
+# Reference link [text][ref] or implicit reference link [text] in one pattern
+# (groups: text, ref; ref is None for an implicit link)
+_RE_REFERENCE_OR_IMPLICIT_LINK = re.compile(r'\[([^\]]+)\](?:\[([^\]]+)\]|(?![\[\(]))')
+# Link destination: url or url "title"
+_RE_LINK_DESTINATION = re.compile(r'^([^\s"]+)(?:\s+"([^"]+)")?$')
+# Stray list marker left at the start of converted list content
+_RE_STRAY_LIST_MARKER = re.compile(r'^[-*+]|\d+\.\s*')
 
 def is_code_block(line):
     """Check if line is a fenced code block delimiter"""
-    stripped = line.strip()
-    return stripped.startswith('```') or stripped.startswith('~~~')
+    # lstrip() returns the line itself when it isn't indented, so this usually doesn't copy
+    return line.lstrip().startswith(('```', '~~~'))
 
 def is_list_item(line):
     """Check if line is a list item (requires whitespace after marker)"""
     stripped = line.lstrip()
+    if not stripped:
+        return False
+    first = stripped[0]
     # Require whitespace after marker so emphasis like "*This" isn't mistaken for a list item
-    return bool(re.match(r"^[-*+]\s+|^\d+\.\s+", stripped))
+    if first in '-*+':
+        return len(stripped) > 1 and stripped[1].isspace()
+    if first.isdigit():
+        return _RE_ORDERED_ITEM.match(stripped) is not None
+    return False
 
 def is_headline(line):
     """Check if line is a headline (header)"""
-    stripped = line.strip()
-    # Match # followed by either whitespace or content (to catch malformed headlines like #BadHeader)
-    return bool(re.match(r'^#+\s', stripped) or re.match(r'^#+[^\s#]', stripped))
+    stripped = line.lstrip()
+    if not stripped.startswith('#'):
+        return False
+    # Match # followed by either whitespace or content (to catch malformed headlines like #BadHeader),
+    # i.e. any non-whitespace left after the run of # markers
+    rest = stripped.lstrip('#')
+    return bool(rest) and not rest.isspace()
+
+def _is_rule_text(text):
+    """Check if stripped text is a run of three or more -, * or _ characters"""
+    # Stripping every marker character leaves nothing only if the run has no others
+    return len(text) >= 3 and not text.strip('-*_')
 
 def is_horizontal_rule(line):
     """Check if line is a horizontal rule"""
-    stripped = line.strip()
-    return bool(re.match(r'^[-*_]{3,}$', stripped))
+    stripped = line.lstrip()
+    if not stripped or stripped[0] not in '-*_':
+        return False
+    return _is_rule_text(stripped.rstrip())
+
+def classify_line(line):
+    """Classify a line by block type with a single dispatch on its first non-blank character
+
+    Returns 'fence', 'headline', 'rule', 'list' or 'blockquote' (these never overlap, and
+    match is_code_block, is_headline, is_horizontal_rule, is_list_item and is_blockquote),
+    or None for anything else (paragraph text, tables, blank lines).
+    """
+    lstripped = line.lstrip()
+    if not lstripped:
+        return None
+    first = lstripped[0]
+    if first == '#':
+        rest = lstripped.lstrip('#')
+        return 'headline' if rest and not rest.isspace() else None
+    if first == '>':
+        return 'blockquote'
+    if first in '`~':
+        return 'fence' if lstripped.startswith(('```', '~~~')) else None
+    if first in '-*+' and len(lstripped) > 1 and lstripped[1].isspace():
+        return 'list'
+    if first in '-*_':
+        return 'rule' if _is_rule_text(lstripped.rstrip()) else None
+    if first.isdigit():
+        return 'list' if _RE_ORDERED_ITEM.match(lstripped) else None
+    return None
 
 def normalize_trailing_whitespace(line):
     """Remove trailing whitespace, but preserve exactly 2 spaces (line break)"""
@@ -972,7 +1109,7 @@ def normalize_headline_spacing(line):
     has_newline = line.endswith('\n')
     line_no_nl = line.rstrip('\n')
 
-    match = re.match(r'^(#+)(\s*)(.*)$', line_no_nl)
+    match = _RE_HEADLINE_SPACING.match(line_no_nl)
     if match:
         hashes = match.group(1)
         spaces = match.group(2)
@@ -983,111 +1120,81 @@ def normalize_headline_spacing(line):
             return result + ('\n' if has_newline else '')
     return line
 
-def normalize_ial_spacing(line):
-    """Normalize IAL (Inline Attribute List) spacing
+def _sub_outside_code_spans(line, substitutions):
+    """Apply (compiled_regex, repl) substitutions in order to the text between code spans
 
-    Normalizes both Kramdown-style ({: ...}) and Pandoc-style ({...}) IALs:
-    - Kramdown: {:.class #id} -> {: .class #id } (space after colon, trailing space before })
-    - Pandoc: { #id .class } -> {#id .class} (no space after opening brace, no trailing space)
-    - Normalizes spacing between attributes (single space)
+    All substitutions share a single scan for backticked code spans, which are left unchanged.
     """
     # Preserve newline
     has_newline = line.endswith('\n')
     line_no_nl = line.rstrip('\n')
 
-    # Don't modify inline code spans like `{:.tip}` or `{%tag%}` when backticked
-    code_span_re = re.compile(r'`+[^`]*`+')
+    def apply(segment):
+        for pattern, repl in substitutions:
+            segment = pattern.sub(repl, segment)
+        return segment
 
-    # Pattern to match IALs: {: ...} or {...}
-    # This matches both Kramdown-style (with colon) and Pandoc-style (without colon)
-    # Match opening brace, optional colon, optional whitespace, content, optional whitespace, closing brace
-    ial_pattern = r'(\{:?\s*)([^}]*?)(\s*\})'
-
-    def normalize_ial(match):
-        opening = match.group(1)  # {: or { with optional space
-        content = match.group(2)  # Attributes
-        closing = match.group(3)  # } with optional space
-
-        # Normalize content: trim and collapse multiple spaces to single space
-        normalized_content = ' '.join(content.split())
-
-        # Determine if it's Kramdown-style (has colon) or Pandoc-style (no colon)
-        if ':' in opening:
-            # Kramdown-style: ensure spaces inside `{:` and `}`
-            return '{: ' + normalized_content + ' }'
-        else:
-            # Pandoc-style: {attributes}
-            # No space after opening brace, no trailing space
-            return '{' + normalized_content + '}'
-
-    # Replace all IALs in the line, but leave backticked code spans unchanged
     parts = []
     last = 0
-    for m in code_span_re.finditer(line_no_nl):
+    for m in _RE_CODE_SPAN.finditer(line_no_nl):
         # Process text before code span
-        segment = line_no_nl[last:m.start()]
-        segment = re.sub(ial_pattern, normalize_ial, segment)
-        parts.append(segment)
+        parts.append(apply(line_no_nl[last:m.start()]))
         # Keep code span as-is
         parts.append(m.group(0))
         last = m.end()
-    tail = line_no_nl[last:]
-    tail = re.sub(ial_pattern, normalize_ial, tail)
-    parts.append(tail)
+    parts.append(apply(line_no_nl[last:]))
     normalized = ''.join(parts)
     return normalized + ('\n' if has_newline else '')
 
-def normalize_liquid_tag_spacing(line):
-    """Normalize Liquid tag spacing
+def _normalize_ial_match(match):
+    """Replacement callback for _RE_IAL
 
-    Ensures spaces inside `{%` and `%}` so `{%tag%}` becomes `{% tag %}`.
-    Supports whitespace-control variants like `{%-tag-%}` -> `{%- tag -%}`.
-    Does not modify backticked inline code spans.
+    Normalizes both Kramdown-style ({: ...}) and Pandoc-style ({...}) IALs:
+    - Kramdown: {:.class #id} -> {: .class #id } (space after colon, trailing space before })
+    - Pandoc: { #id .class } -> {#id .class} (no space after opening brace, no trailing space)
+    - Normalizes spacing between attributes (single space)
     """
-    has_newline = line.endswith('\n')
-    line_no_nl = line.rstrip('\n')
+    opening = match.group(1)  # {: or { with optional space
+    content = match.group(2)  # Attributes
+    closing = match.group(3)  # } with optional space
 
-    code_span_re = re.compile(r'`+[^`]*`+')
-    liquid_re = re.compile(r'(\{%-?)(.*?)(-?%\})')
+    # Normalize content: trim and collapse multiple spaces to single space
+    normalized_content = ' '.join(content.split())
 
-    def repl(m):
-        opening = m.group(1)
-        content = m.group(2).strip()
-        closing = m.group(3)
-        if not content:
-            return f"{opening} {closing}"
-        return f"{opening} {content} {closing}"
+    # Determine if it's Kramdown-style (has colon) or Pandoc-style (no colon)
+    if ':' in opening:
+        # Kramdown-style: ensure spaces inside `{:` and `}`
+        return '{: ' + normalized_content + ' }'
+    else:
+        # Pandoc-style: {attributes}
+        # No space after opening brace, no trailing space
+        return '{' + normalized_content + '}'
 
-    parts = []
-    last = 0
-    for m in code_span_re.finditer(line_no_nl):
-        segment = line_no_nl[last:m.start()]
-        segment = liquid_re.sub(repl, segment)
-        parts.append(segment)
-        parts.append(m.group(0))
-        last = m.end()
-    tail = line_no_nl[last:]
-    tail = liquid_re.sub(repl, tail)
-    parts.append(tail)
+def _normalize_liquid_match(m):
+    """Replacement callback for _RE_LIQUID
 
-    normalized = ''.join(parts)
-    return normalized + ('\n' if has_newline else '')
+    Ensures spaces inside `{%` and `%}` so `{%tag%}` becomes `{% tag %}`.
+    Supports whitespace-control variants like `{%-tag-%}` -> `{%- tag -%}`.
+    """
+    opening = m.group(1)
+    content = m.group(2).strip()
+    closing = m.group(3)
+    if not content:
+        return f"{opening} {closing}"
+    return f"{opening} {content} {closing}"
 
 def normalize_fenced_code_lang(line):
     """Normalize fenced code block language identifier spacing
 
     Removes space after opening backticks: ``` python -> ```python
     """
-    # Pattern to match fenced code blocks with language identifier
-    # Matches ``` or ~~~ followed by optional space and language identifier
-    pattern = r'^(```|~~~)\s+([^\s`~]+)'
-
+    # _RE_FENCE_LANG matches ``` or ~~~ followed by optional space and language identifier
     def normalize(match):
         fence = match.group(1)
         lang = match.group(2)
         return fence + lang
 
-    normalized = re.sub(pattern, normalize, line)
+    normalized = _RE_FENCE_LANG.sub(normalize, line)
     return normalized
 
 def normalize_reference_link(line):
@@ -1095,14 +1202,13 @@ def normalize_reference_link(line):
 
     Normalizes spacing around colon: [ref] : url -> [ref]: url
     """
-    # Pattern to match reference link definitions: [id]: url "title"
-    # Matches [id] followed by optional space, colon, optional space, url, optional title
-    pattern = r'^(\[[^\]]+\])\s*:\s*'
+    # _RE_REF_LINK matches reference link definitions: [id]: url "title"
+    # i.e. [id] followed by optional space, colon, optional space, url, optional title
 
     def normalize(match):
         return match.group(1) + ': '
 
-    normalized = re.sub(pattern, normalize, line)
+    normalized = _RE_REF_LINK.sub(normalize, line)
     return normalized
 
 def normalize_task_checkbox(line):
@@ -1110,8 +1216,7 @@ def normalize_task_checkbox(line):
 
     Converts - [X] to - [x] for consistency
     """
-    # Pattern to match task list items with uppercase X
-    pattern = r'^(\s*[-*+])\s+(\[[Xx]\])\s+'
+    # _RE_TASK matches task list items with uppercase X
 
     def normalize(match):
         marker = match.group(1)
@@ -1119,7 +1224,7 @@ def normalize_task_checkbox(line):
         # Convert to lowercase x
         return marker + ' [x] '
 
-    normalized = re.sub(pattern, normalize, line)
+    normalized = _RE_TASK.sub(normalize, line)
     return normalized
 
 def normalize_blockquote_spacing(line):
@@ -1127,15 +1232,14 @@ def normalize_blockquote_spacing(line):
 
     Ensures space after >: >text -> > text
     """
-    # Pattern to match blockquote without space after >
-    pattern = r'^(\s*)>([^\s>])'
+    # _RE_BLOCKQUOTE matches blockquote without space after >
 
     def normalize(match):
         indent = match.group(1)
         content = match.group(2)
         return indent + '> ' + content
 
-    normalized = re.sub(pattern, normalize, line)
+    normalized = _RE_BLOCKQUOTE.sub(normalize, line)
     return normalized
 
 def normalize_math_spacing(line, is_in_code_block=False):
@@ -1154,9 +1258,8 @@ def normalize_math_spacing(line, is_in_code_block=False):
     has_newline = line.endswith('\n')
     line_no_nl = line.rstrip('\n')
 
-    # Pattern for display math: $$...$$
+    # _RE_DISPLAY_MATH matches display math: $$...$$
     # This handles both single-line and multi-line (using DOTALL to match across newlines)
-    display_math_pattern = r'\$\$([\s\S]*?)\$\$'
 
     def normalize_display_math(match):
         content = match.group(1)
@@ -1179,13 +1282,12 @@ def normalize_math_spacing(line, is_in_code_block=False):
         return '$$' + normalized + '$$'
 
     # Replace display math blocks (using DOTALL flag to match across newlines)
-    normalized = re.sub(display_math_pattern, normalize_display_math, line_no_nl, flags=re.DOTALL)
+    normalized = _RE_DISPLAY_MATH.sub(normalize_display_math, line_no_nl)
 
     # For inline math, be very conservative - only normalize if it looks like math
     # (contains operators, letters, or is clearly mathematical)
     # Skip currency patterns like $1.50, $2, etc.
     # Also skip if closing $ has space before it and non-space after it (not math)
-    inline_math_pattern = r'\$([^\$]+?)\$'
 
     def normalize_inline_math(match):
         content = match.group(1)
@@ -1202,37 +1304,85 @@ def normalize_math_spacing(line, is_in_code_block=False):
 
         # Otherwise, check if it looks like currency
         trimmed_content = content.strip()
-        if re.match(r'^[\d.,\s]+$', trimmed_content):
+        if _RE_CURRENCY.match(trimmed_content):
             # Looks like currency, don't normalize
             return '$' + content + '$'
         # Looks like math, normalize spacing
         return '$' + trimmed_content + '$'
 
     # Replace inline math (conservatively)
-    normalized = re.sub(inline_math_pattern, normalize_inline_math, normalized)
+    normalized = _RE_INLINE_MATH.sub(normalize_inline_math, normalized)
 
     return normalized + ('\n' if has_newline else '')
 
-def levenshtein_distance(s1, s2):
-    """Calculate Levenshtein distance between two strings"""
+def levenshtein_distance(s1, s2, max_distance=None):
+    """Calculate Levenshtein distance between two strings
+
+    If max_distance is given, only cells within max_distance of the diagonal are
+    computed (Ukkonen's band) and the scan stops as soon as a whole row exceeds it.
+    Distances above max_distance are reported as max_distance + 1.
+    """
+    # Keep s2 as the shorter string so rows stay small
     if len(s1) < len(s2):
-        return levenshtein_distance(s2, s1)
+        s1, s2 = s2, s1
+
+    if max_distance is not None and len(s1) - len(s2) > max_distance:
+        return max_distance + 1
 
     if len(s2) == 0:
         return len(s1)
 
-    previous_row = range(len(s2) + 1)
-    for i, c1 in enumerate(s1):
-        current_row = [i + 1]
-        for j, c2 in enumerate(s2):
-            insertions = previous_row[j + 1] + 1
-            deletions = current_row[j] + 1
-            substitutions = previous_row[j] + (c1 != c2)
-            current_row.append(min(insertions, deletions, substitutions))
-        previous_row = current_row
-
-    return previous_row[-1]
-
+    # Compare ASCII strings (all emoji names) as bytes: iterating yields ints,
+    # so each cell is an integer compare rather than a str compare
+    if s1.isascii() and s2.isascii():
+        s1 = s1.encode('ascii')
+        s2 = s2.encode('ascii')
+
+    if max_distance is None:
+        previous_row = list(range(len(s2) + 1))
+        current_row = [0] * (len(s2) + 1)
+        for i, c1 in enumerate(s1):
+            current_row[0] = i + 1
+            for j, c2 in enumerate(s2):
+                insertions = previous_row[j + 1] + 1
+                deletions = current_row[j] + 1
+                substitutions = previous_row[j] + (c1 != c2)
+                current_row[j + 1] = min(insertions, deletions, substitutions)
+            previous_row, current_row = current_row, previous_row
+
+        return previous_row[-1]
+
+    # Banded DP: cells outside the band hold the cap value
+    cap = max_distance + 1
+    width = len(s2)
+    previous_row = [min(j, cap) for j in range(width + 1)]
+    current_row = [cap] * (width + 1)
+    for i, c1 in enumerate(s1, 1):
+        low = max(1, i - max_distance)
+        high = min(width, i + max_distance)
+        current_row[0] = min(i, cap)
+        if low > 1:
+            current_row[low - 1] = cap
+        row_min = current_row[0]
+        for j in range(low, high + 1):
+            value = min(
+                previous_row[j] + 1,  # insertion
+                current_row[j - 1] + 1,  # deletion
+                previous_row[j - 1] + (c1 != s2[j - 1]),  # substitution
+                cap,
+            )
+            current_row[j] = value
+            if value < row_min:
+                row_min = value
+        if high < width:
+            current_row[high + 1] = cap
+        if row_min >= cap:
+            return cap
+        previous_row, current_row = current_row, previous_row
+
+    return previous_row[width]
+
+@functools.lru_cache(maxsize=None)
 def normalize_emoji_name(name):
     """Normalize emoji name: lowercase, hyphens to underscores, remove colons"""
     name = name.strip(':')
@@ -1240,6 +1390,7 @@ def normalize_emoji_name(name):
     name = name.replace('-', '_')
     return name
 
+@functools.lru_cache(maxsize=4096)
 def find_best_emoji_match(name, max_distance=4):
     """Find best emoji match using fuzzy matching
 
@@ -1251,24 +1402,50 @@ def find_best_emoji_match(name, max_distance=4):
     if normalized in VALID_EMOJI_NAMES_SET:
         return normalized
 
+    # Only names of similar length can be within max_distance
+    choices = []
+    for length in range(max(0, len(normalized) - max_distance), len(normalized) + max_distance + 1):
+        choices.extend(_EMOJI_NAMES_BY_LEN.get(length, ()))
+
+    # q-gram lemma: each edit destroys at most 3 of the query's trigrams, so a name
+    # within max_distance shares at least this many of them (counted with multiplicity)
+    min_shared = len(normalized) - 2 - 3 * max_distance
+    if min_shared > 0:
+        shared = Counter()
+        for trigram, query_count in _trigram_counts(normalized).items():
+            for emoji_name, count in _EMOJI_TRIGRAM_INDEX.get(trigram, ()):
+                shared[emoji_name] += min(query_count, count)
+        choices = [emoji_name for emoji_name in choices if shared[emoji_name] >= min_shared]
+
     # Find fuzzy matches
-    candidates = []
-    for emoji_name in VALID_EMOJI_NAMES:
-        distance = levenshtein_distance(normalized, emoji_name)
-        if distance <= max_distance:
-            candidates.append((distance, len(emoji_name), emoji_name))
+    rapidfuzz = _rapidfuzz_modules()
+    if rapidfuzz is not None:
+        rf_process, rf_levenshtein = rapidfuzz
+        # One batched call scores the whole shortlist in C++; score_cutoff lets
+        # rapidfuzz abandon a candidate as soon as it exceeds max_distance
+        candidates = [
+            (distance, len(emoji_name), emoji_name)
+            for emoji_name, distance, _ in rf_process.extract(
+                normalized, choices, scorer=rf_levenshtein.distance,
+                score_cutoff=max_distance, limit=None
+            )
+        ]
+    else:
+        candidates = []
+        for emoji_name in choices:
+            distance = levenshtein_distance(normalized, emoji_name, max_distance)
+            if distance <= max_distance:
+                candidates.append((distance, len(emoji_name), emoji_name))
 
     if not candidates:
         return None
 
-    # Sort by distance (lowest first), then by length (shortest first)
-    candidates.sort(key=lambda x: (x[0], x[1]))
-    return candidates[0][2]
+    # Lowest distance wins, then shortest name, then alphabetical
+    return min(candidates)[2]
 
 def normalize_emoji_names(line):
     """Normalize emoji names in a line, correcting typos using fuzzy matching"""
-    # Pattern to match :emoji_name: (alphanumeric, underscores, hyphens, plus signs)
-    pattern = r':([a-zA-Z0-9_+-]+):'
+    # _RE_EMOJI matches :emoji_name: (alphanumeric, underscores, hyphens, plus signs)
 
     def replace_emoji(match):
         emoji_name = match.group(1)
@@ -1286,7 +1463,34 @@ def normalize_emoji_names(line):
         # No match found, return original
         return match.group(0)
 
-    return re.sub(pattern, replace_emoji, line)
+    return _RE_EMOJI.sub(replace_emoji, line)
+
+def _build_typography_table(skip_em_dash, skip_guillemet):
+    """Build the str.translate table used by normalize_typography"""
+    table = {
+        # Curly quotes to straight quotes
+        '\u201c': '"',  # Left double quote
+        '\u201d': '"',  # Right double quote
+        '\u2018': "'",  # Left single quote
+        '\u2019': "'",  # Right single quote
+        '\u2013': '--',  # En dash to --
+        '\u2026': '...',  # Ellipsis to ...
+    }
+    # Em dash to --- (unless skipped)
+    if not skip_em_dash:
+        table['\u2014'] = '---'
+    # Guillemets to quotes (unless skipped)
+    if not skip_guillemet:
+        table['\u00ab'] = '"'
+        table['\u00bb'] = '"'
+    return str.maketrans(table)
+
+# Typography translate tables keyed by (skip_em_dash, skip_guillemet)
+_TYPOGRAPHY_TABLES = {
+    (em, guil): _build_typography_table(em, guil)
+    for em in (False, True)
+    for guil in (False, True)
+}
 
 def normalize_typography(line, skip_em_dash=False, skip_guillemet=False):
     """Normalize typography: curly quotes, dashes, ellipses, guillemets
@@ -1296,31 +1500,137 @@ def normalize_typography(line, skip_em_dash=False, skip_guillemet=False):
         skip_em_dash: If True, leave em dashes as-is
         skip_guillemet: If True, leave guillemets as-is
     """
-    result = line
+    # Single pass over the line with the precomputed table for this flag combination
+    return line.translate(_TYPOGRAPHY_TABLES[(bool(skip_em_dash), bool(skip_guillemet))])
 
-    # Curly quotes to straight quotes
-    result = result.replace('"', '"')  # Left double quote
-    result = result.replace('"', '"')  # Right double quote
-    result = result.replace(''', "'")   # Left single quote
-    result = result.replace(''', "'")   # Right single quote
+# Emphasis scanners for normalize_bold_italic. Each one walks the line left
+# to right with str.find, consuming matches the way a regex substitution
+# would, so no pass can backtrack. is_protected(pos) reports whether a match
+# starting at pos sits inside a code span or emoji marker.
 
-    # En dash to --
-    result = result.replace('–', '--')  # U+2013
+# Folds both emphasis markers to '*' so runs of three can be found with find()
+_EMPHASIS_MARKER_FOLD = str.maketrans('_', '*')
 
-    # Em dash to --- (unless skipped)
-    if not skip_em_dash:
-        result = result.replace('—', '---')  # U+2014
-
-    # Ellipsis to ...
-    result = result.replace('…', '...')  # U+2026
+def _at_word_char(text, pos):
+    """Check if the character at pos exists and is alphanumeric or an underscore"""
+    return 0 <= pos < len(text) and (text[pos].isalnum() or text[pos] == '_')
 
-    # Guillemets to quotes (unless skipped)
-    if not skip_guillemet:
-        result = result.replace('«', '"')  # U+00AB
-        result = result.replace('»', '"')  # U+00BB
-
-    return result
+def _scan_bold_italic(text, is_protected, open_with, close_with):
+    """Rewrite balanced three-marker combos (***text***, _**text**_, ...)
 
+    Three markers open, the shortest non-empty run of content on the same
+    line follows, then three markers close. The combo is rewritten only when
+    the closing markers mirror the opening ones; either way the scan resumes
+    after it.
+    """
+    folded = text.translate(_EMPHASIS_MARKER_FOLD)
+    pos = folded.find('***')
+    if pos == -1:
+        return text
+    pieces = []
+    add_piece = pieces.append  # bound once for the scan loop
+    last = 0
+    while pos != -1:
+        close = folded.find('***', pos + 4)
+        if close == -1:
+            # No closing run left for this or any later opening run
+            break
+        newline = text.find('\n', pos + 3, close)
+        if newline != -1:
+            # Every opening run before the newline would need the same
+            # closing run across it, so resume after the newline
+            pos = folded.find('***', newline + 1)
+            continue
+        end = close + 3
+        if not is_protected(pos) and text[close:end] == text[pos:pos + 3][::-1]:
+            add_piece(text[last:pos])
+            add_piece(open_with + text[pos + 3:close] + close_with)
+            last = end
+        pos = folded.find('***', end)
+    add_piece(text[last:])
+    return ''.join(pieces)
+
+def _scan_bold_star(text, is_protected):
+    """Rewrite **text** as __text__
+
+    Skips a ** preceded by * and a closing ** followed by * or _, leaving
+    nested combos like **_text_** alone. Content stays on one line and may
+    contain single markers.
+    """
+    pos = text.find('**')
+    if pos == -1:
+        return text
+    pieces = []
+    add_piece = pieces.append  # bound once for the scan loop
+    last = 0
+    length = len(text)
+    # Next usable closing ** and next newline; both only move forward, and
+    # length stands in for "none left"
+    close = newline = -1
+    while pos != -1:
+        end = -1
+        if pos == 0 or text[pos - 1] != '*':
+            if close < pos + 3:
+                close = text.find('**', pos + 3)
+                while close != -1 and close + 2 < length and text[close + 2] in '*_':
+                    close = text.find('**', close + 1)
+                if close == -1:
+                    close = length
+            if newline < pos + 2:
+                newline = text.find('\n', pos + 2)
+                if newline == -1:
+                    newline = length
+            if close < newline:
+                end = close + 2
+        if end == -1:
+            pos = text.find('**', pos + 1)
+            continue
+        if not is_protected(pos):
+            add_piece(text[last:pos])
+            add_piece('__' + text[pos + 2:end - 2] + '__')
+            last = end
+        pos = text.find('**', end)
+    add_piece(text[last:])
+    return ''.join(pieces)
+
+def _scan_delimited_emphasis(text, marker, width, replace_with, is_protected, word_boundaries):
+    """Rewrite runs delimited by width copies of marker (e.g. _text_ or __text__)
+
+    The delimiters must not touch another copy of marker, and the content
+    must be non-empty and free of it. With word_boundaries, a match directly
+    preceded or followed by a word character is left alone.
+    """
+    delimiter = marker * width
+    pos = text.find(delimiter)
+    if pos == -1:
+        return text
+    pieces = []
+    add_piece = pieces.append  # bound once for the scan loop
+    last = 0
+    length = len(text)
+    while pos != -1:
+        end = -1
+        content_start = pos + width
+        if (text.startswith(delimiter, pos)
+                and (pos == 0 or text[pos - 1] != marker)
+                and content_start < length and text[content_start] != marker):
+            close = text.find(marker, content_start + 1)
+            if (close != -1 and text.startswith(delimiter, close)
+                    and (close + width >= length or text[close + width] != marker)):
+                end = close + width
+        if end == -1:
+            pos = text.find(marker, pos + 1)
+            continue
+        if not is_protected(pos) and not (
+                word_boundaries and (_at_word_char(text, pos - 1) or _at_word_char(text, end))):
+            add_piece(text[last:pos])
+            add_piece(replace_with + text[content_start:close] + replace_with)
+            last = end
+        pos = text.find(marker, end)
+    add_piece(text[last:])
+    return ''.join(pieces)
+
+@functools.lru_cache(maxsize=4096)
 def normalize_bold_italic(line, reverse_emphasis=False):
     """Normalize bold and italic markers
 
@@ -1330,154 +1640,55 @@ def normalize_bold_italic(line, reverse_emphasis=False):
     - Handle triple: ***text*** → __*text*__ (or reversed: ___text___ → **text**)
     - Skip inside code spans, code blocks, and emoji markers
     """
-    # First, identify protected regions (code spans, emoji markers)
-    # Code spans: `code` or ``code``
-    code_span_pattern = r'`+[^`]*`+'
-    # Emoji markers: :emoji_name:
-    emoji_pattern = r':[a-z0-9_+-]+:'
-
-    # Collect all protected regions
-    protected_ranges = []
-
-    for match in re.finditer(code_span_pattern, line):
-        protected_ranges.append((match.start(), match.end()))
-
-    for match in re.finditer(emoji_pattern, line):
-        protected_ranges.append((match.start(), match.end()))
+    # Most lines have no emphasis markers at all
+    if '_' not in line and '*' not in line:
+        return line
 
-    # Sort and merge overlapping ranges
-    protected_ranges.sort()
+    # First, identify protected regions (code spans, emoji markers)
+    # Code spans: `code` or ``code``; emoji markers: :emoji_name:
+    # _RE_EMPHASIS_PROTECT finds both in one left-to-right pass, so matches
+    # arrive already ordered and only adjacent ranges need merging
     merged = []
-    for start, end in protected_ranges:
-        if merged and start <= merged[-1][1]:
-            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
-        else:
-            merged.append((start, end))
+    if '`' in line or ':' in line:
+        add_range = merged.append
+        for match in _RE_EMPHASIS_PROTECT.finditer(line):
+            start, end = match.span()
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                add_range((start, end))
 
     # Helper to check if a position is in a protected region
-    def is_protected(pos):
-        return any(start <= pos < end for start, end in merged)
-
-    # Helper to replace only if not in protected region
-    def replace_if_not_protected(pattern, replacement):
-        def replacer(match):
-            if is_protected(match.start()):
-                return match.group(0)
-            return re.sub(pattern, replacement, match.group(0))
-        return replacer
+    # (merged ranges are sorted and disjoint, so bisect on their starts)
+    protected_starts = [start for start, _ in merged]
 
-    result = line
+    def is_protected(pos):
+        idx = bisect.bisect_right(protected_starts, pos) - 1
+        return idx >= 0 and pos < merged[idx][1]
 
+    # Each pass keeps the line length unchanged, so protected offsets stay valid
     if reverse_emphasis:
         # Reversed: ** for bold, _ for italic
-        # Handle ALL bold-italic combinations first (before standalone patterns)
-        # All should normalize to: _**text**_
-
-        # General approach: match any 3-marker combo and normalize to _**text**_
-        def normalize_bold_italic_reverse_general(match):
-            if is_protected(match.start()):
-                return match.group(0)
-            opening = match.group(1)
-            content = match.group(2)
-            closing = match.group(3)
-
-            # Verify closing is reverse of opening
-            expected_closing = opening[::-1]
-            if closing != expected_closing:
-                return match.group(0)
-
-            # Normalize to _**content**_
-            return f'_**{content}**_'
-
-        # Match any 3 markers + content + any 3 markers, verify balanced
-        result = re.sub(r'([_*]{3})(.+?)([_*]{3})', normalize_bold_italic_reverse_general, result)
-
-        # Now handle standalone bold and italic
-        # Bold with __ → **
-        # Only match if at word boundaries (preceded by space/punctuation/start, followed by space/punctuation/end)
-        def replace_bold_rev(match):
-            if is_protected(match.start()):
-                return match.group(0)
-            # Check word boundaries
-            start_pos = match.start()
-            end_pos = match.end()
-            preceded_by_word_char = start_pos > 0 and (result[start_pos - 1].isalnum() or result[start_pos - 1] == '_')
-            followed_by_word_char = end_pos < len(result) and (result[end_pos].isalnum() or result[end_pos] == '_')
-            if preceded_by_word_char or followed_by_word_char:
-                return match.group(0)  # Not at word boundary, leave alone
-            return f'**{match.group(1)}**'
-        result = re.sub(r'(?<!_)__([^_]+?)__(?!_)', replace_bold_rev, result)
-
+        # Bold-italic combos first (***text***, _**text**_, ...) → _**text**_
+        result = _scan_bold_italic(line, is_protected, '_**', '**_')
+        # Bold with __ → ** (only at word boundaries)
+        result = _scan_delimited_emphasis(result, '_', 2, '**', is_protected, True)
         # Italics with * → _
-        def replace_italic_rev(match):
-            if is_protected(match.start()):
-                return match.group(0)
-            return f'_{match.group(1)}_'
-        result = re.sub(r'(?<!\*)\*([^*]+?)\*(?!\*)', replace_italic_rev, result)
+        result = _scan_delimited_emphasis(result, '*', 1, '_', is_protected, False)
     else:
         # Normal: __ for bold, * for italic
-        # Handle ALL bold-italic combinations first (before standalone patterns)
-        # All should normalize to: __*text*__
-        # A bold-italic combo has exactly 3 markers total (any combination of _ and *)
-
-        # General approach: match any 3-character combination of _ and * at start,
-        # then content (non-greedy), then verify closing markers are reverse of opening
-        def normalize_bold_italic_general(match):
-            if is_protected(match.start()):
-                return match.group(0)
-            # Group 1: opening markers (3 chars of _ and *)
-            # Group 2: content
-            # Group 3: closing markers
-            opening = match.group(1)
-            content = match.group(2)
-            closing = match.group(3)
-
-            # Verify closing is reverse of opening (ensures balanced bold-italic combo)
-            expected_closing = opening[::-1]
-            if closing != expected_closing:
-                # Not a valid bold-italic combo (e.g., ***text___), return original
-                return match.group(0)
-
-            # Normalize to __*content*__
-            return f'__*{content}*__'
-
-        # Match any 3 markers + content + any 3 markers, then verify they're balanced
-        # Use \S to ensure content starts with non-whitespace (avoids matching across word boundaries incorrectly)
-        # But allow whitespace in the middle of content
-        # Pattern: ([_*]{3})(\S.*?\S)([_*]{3}) - ensures content has at least 2 non-whitespace chars
-        # However, this might be too restrictive. Let's use a simpler approach:
-        # Match any 3 markers, then non-greedy content (at least 1 char), then any 3 markers
-        result = re.sub(r'([_*]{3})(.+?)([_*]{3})', normalize_bold_italic_general, result)
-
-        # Now handle standalone bold and italic
-        # Bold with ** → __
-        # Don't match if followed by _ (that's a nested pattern like **_text_**)
-        def replace_bold(match):
-            if is_protected(match.start()):
-                return match.group(0)
-            return f'__{match.group(1)}__'
-        # Negative lookbehind: not preceded by *
-        # Negative lookahead: not followed by * or _ (to avoid matching nested patterns)
-        # Use .+? instead of [^*]+? to allow * in content (for nested italic)
-        result = re.sub(r'(?<!\*)\*\*(.+?)\*\*(?![*_])', replace_bold, result)
-
-        # Italics with _ → *
-        # Only match if at word boundaries (preceded by space/punctuation/start, followed by space/punctuation/end)
-        def replace_italic(match):
-            if is_protected(match.start()):
-                return match.group(0)
-            # Check word boundaries
-            start_pos = match.start()
-            end_pos = match.end()
-            preceded_by_word_char = start_pos > 0 and (result[start_pos - 1].isalnum() or result[start_pos - 1] == '_')
-            followed_by_word_char = end_pos < len(result) and (result[end_pos].isalnum() or result[end_pos] == '_')
-            if preceded_by_word_char or followed_by_word_char:
-                return match.group(0)  # Not at word boundary, leave alone
-            return f'*{match.group(1)}*'
-        result = re.sub(r'(?<!_)_([^_]+?)_(?!_)', replace_italic, result)
+        # Bold-italic combos first (***text***, **_text_**, ...) → __*text*__
+        result = _scan_bold_italic(line, is_protected, '__*', '*__')
+        # Bold with ** → __ (not when nested like **_text_**)
+        result = _scan_bold_star(result, is_protected)
+        # Italics with _ → * (only at word boundaries)
+        result = _scan_delimited_emphasis(result, '_', 1, '*', is_protected, True)
 
     return result
 
+# Translation table deleting every character allowed in a table separator row
+_TABLE_SEPARATOR_DELETE = str.maketrans('', '', '|:- ')
+
 def is_table_row(line):
     """Check if line is a table row (contains pipe characters)"""
     stripped = line.strip()
@@ -1485,9 +1696,7 @@ def is_table_row(line):
     if '|' not in stripped:
         return False
     # Not a separator row (separator rows contain only |, :, -, spaces)
-    if set(stripped.replace('|', '')).issubset(':- '):
-        return False
-    return True
+    return bool(stripped.translate(_TABLE_SEPARATOR_DELETE))
 
 def is_separator_row(line):
     """Check if line is a table separator row"""
@@ -1496,7 +1705,7 @@ def is_separator_row(line):
     if '|' not in stripped:
         return False
     # Separator rows contain only |, :, -, spaces
-    return set(stripped.replace('|', '')).issubset(':- ')
+    return not stripped.translate(_TABLE_SEPARATOR_DELETE)
 
 def count_columns(line):
     """Count the number of columns in a table row"""
@@ -1513,6 +1722,11 @@ def count_columns(line):
     else:
         return pipe_count + 1
 
+# Alignment type from the separator row -> str method that pads a cell to width
+_TABLE_JUSTIFIERS = {'::': str.center, '-:': str.rjust, ':-': str.ljust}
+# Same for the format-spec alignment of columns that aren't centered
+_TABLE_FORMAT_ALIGN = {'-:': '>', ':-': '<'}
+
 def normalize_table_formatting(table_lines):
     """Normalize table formatting using Dr. Drang's algorithm
 
@@ -1525,9 +1739,18 @@ def normalize_table_formatting(table_lines):
     """
     if not table_lines:
         return None
-
-    # Remove empty lines
-    lines = [line.rstrip('\n') for line in table_lines if line.strip()]
+    # Identical tables (repeated across a document or a multi-file run) are
+    # formatted once; hand back a fresh list so callers can't alter the cache
+    normalized = _normalize_table_formatting(tuple(table_lines))
+    return list(normalized) if normalized is not None else None
+
+@functools.lru_cache(maxsize=256)
+def _normalize_table_formatting(table_lines):
+    """Format a tuple of table lines for normalize_table_formatting (cached)"""
+
+    # Strip each line once and remove empty lines; the row helpers below
+    # strip again, which is free (no copy) on an already-stripped string
+    lines = [stripped for stripped in (line.strip() for line in table_lines) if stripped]
     if len(lines) < 2:
         return None
 
@@ -1565,9 +1788,7 @@ def normalize_table_formatting(table_lines):
         separator_idx = 1
 
     # Extract separator line and determine alignment
-    formatline = lines[separator_idx].strip()
-    if not formatline:
-        return None
+    formatline = lines[separator_idx]
     if formatline[0] == '|':
         formatline = formatline[1:]
     if formatline and formatline[-1] == '|':
@@ -1592,11 +1813,7 @@ def normalize_table_formatting(table_lines):
 
     # Extract content into matrix
     content = []
-    for line in content_lines:
-        stripped = line.strip()
-        if not stripped:
-            # Empty line, skip it
-            continue
+    for stripped in content_lines:
         if stripped[0] == '|':
             stripped = stripped[1:]
         if stripped and stripped[-1] == '|':
@@ -1607,33 +1824,29 @@ def normalize_table_formatting(table_lines):
         content.append(linecontent)
 
     # Append cells to rows that don't have enough
-    for i in range(len(content)):
-        while len(content[i]) < columns:
-            content[i].append(' ')
-
-    # Get width of content in each column
-    widths = [2] * columns
     for row in content:
-        for i in range(columns):
-            # Use len() which handles Unicode correctly in Python 3
-            widths[i] = max(len(row[i]), widths[i])
-
-    # Justify function
-    def just(string, type, n):
-        """Justify a string to length n according to type."""
-        if type == '::':
-            return string.center(n)
-        elif type == '-:':
-            return string.rjust(n)
-        elif type == ':-':
-            return string.ljust(n)
-        else:
-            return string
+        if len(row) < columns:
+            row.extend([' '] * (columns - len(row)))
+
+    # Get width of content in each column (at least 2); every row now has
+    # at least `columns` cells, so zip yields each column in full
+    # Use len() which handles Unicode correctly in Python 3
+    widths = [max(2, *map(len, column)) for column in zip(*content)][:columns]
 
     # Format rows
-    formatted = []
-    for row in content:
-        formatted.append('|' + '|'.join([just(s, t, n) for (s, t, n) in zip(row, justify, widths)]) + '|')
+    if '::' in justify:
+        # str.center places odd padding differently than format's '^', so
+        # tables with centered columns justify cell by cell
+        justifiers = [_TABLE_JUSTIFIERS[t] for t in justify]
+        formatted = [
+            '|' + '|'.join([just(s, n) for (s, just, n) in zip(row, justifiers, widths)]) + '|'
+            for row in content
+        ]
+    else:
+        # Build one row template for this column layout and fill it per row
+        # (extra cells beyond the last column are ignored, as with zip)
+        row_format = '|' + '|'.join([f'{{:{_TABLE_FORMAT_ALIGN[t]}{n}}}' for (t, n) in zip(justify, widths)]) + '|'
+        formatted = [row_format.format(*row) for row in content]
 
     # Recreate format line with appropriate column widths
     formatline = '|' + '|'.join([s[0] + '-' * (n - 2) + s[-1] for (s, n) in zip(justify, widths)]) + '|'
@@ -1647,7 +1860,7 @@ def normalize_table_formatting(table_lines):
         formatted.insert(1, formatline)
 
     # Add newlines back
-    return [line + '\n' for line in formatted]
+    return tuple(line + '\n' for line in formatted)
 
 def detect_list_indent_unit(lines, start_idx):
     """Detect the base indentation unit for a list (2 or 4 spaces)
@@ -1664,15 +1877,14 @@ def detect_list_indent_unit(lines, start_idx):
             # Hit a non-list item, the list starts at the next line
             list_start = i + 1
             break
-        # Check if this is an unindented list item (start of list)
-        match = re.match(r'^(\s*)([-*+]|\d+\.)', line)
-        if match:
-            indent = match.group(1)
-            space_count = len(indent.replace('\t', ''))
-            if space_count == 0:
-                # Found the start of the list
-                list_start = i
-                break
+        # Check if this is an unindented list item (start of list); the
+        # marker is known to be there, so only the indent needs measuring
+        indent_len = _indent_len(line)
+        space_count = indent_len - line.count('\t', 0, indent_len)
+        if space_count == 0:
+            # Found the start of the list
+            list_start = i
+            break
 
     # Now scan forward from list start to find first indented item
     for i in range(list_start + 1, len(lines)):
@@ -1684,41 +1896,66 @@ def detect_list_indent_unit(lines, start_idx):
             continue
 
         # Get indentation (spaces only, ignore tabs)
-        match = re.match(r'^(\s*)([-*+]|\d+\.)', line)
-        if match:
-            indent = match.group(1)
-            space_count = len(indent.replace('\t', ''))
-            if space_count >= 2:
-                # Found first indentation - return it as base unit
-                # Round to nearest 2 or 4
-                if space_count >= 4:
-                    return 4
-                else:
-                    return 2
+        indent_len = _indent_len(line)
+        space_count = indent_len - line.count('\t', 0, indent_len)
+        if space_count >= 2:
+            # Found first indentation - return it as base unit
+            # Round to nearest 2 or 4
+            if space_count >= 4:
+                return 4
+            else:
+                return 2
 
     # Default to 2 spaces if no indented item found
     return 2
 
+def _parse_list_item(line):
+    """Split a list item into (indent, marker, marker_space, content) in one scan
+
+    Equivalent to matching ^(\s*)([-*+]|\d+\.)(\s+)(.*)$ but without a regex.
+    marker_space must be non-empty, so emphasis like "*This" is not an
+    item. A single trailing newline is left out of content. Returns None
+    when the line is not a list item.
+    """
+    length = len(line)
+    i = 0
+    while i < length and line[i].isspace():
+        i += 1
+    j = i
+    if j < length and line[j] in '-*+':
+        j += 1
+    else:
+        while j < length and line[j].isdecimal():
+            j += 1
+        if j == i or j >= length or line[j] != '.':
+            return None
+        j += 1
+    k = j
+    while k < length and line[k].isspace():
+        k += 1
+    if k == j:
+        return None
+    content = line[k:]
+    if content.endswith('\n'):
+        content = content[:-1]
+    if '\n' in content:
+        return None
+    return line[:i], line[i:j], line[j:k], content
+
 def spaces_to_tabs_for_list(line, indent_unit):
     """Convert list indentation spaces to tabs based on detected indent unit
     If indent_unit is 2: 2 spaces = 1 tab, 4 spaces = 2 tabs, etc.
     If indent_unit is 4: 4 spaces = 1 tab, 8 spaces = 2 tabs, etc.
     """
-    if not is_list_item(line):
-        return line
-
     # Preserve newline
     has_newline = line.endswith('\n')
     line_no_nl = line.rstrip('\n')
 
-    # Match list items with or without space after marker
-    # Require at least one whitespace after list marker to avoid matching emphasis like "*This"
-    match = re.match(r'^(\s*)([-*+]|\d+\.)(\s+)(.*)$', line_no_nl)
-    if match:
-        indent = match.group(1)
-        marker = match.group(2)
-        marker_space = match.group(3)
-        content = match.group(4)
+    # Split the item (None when this is not a list item)
+    # Requires at least one whitespace after list marker to avoid matching emphasis like "*This"
+    parts = _parse_list_item(line_no_nl)
+    if parts:
+        indent, marker, marker_space, content = parts
 
         # Normalize: ensure exactly one space after marker
         if marker_space != ' ':
@@ -1730,7 +1967,7 @@ def spaces_to_tabs_for_list(line, indent_unit):
             return line
 
         # Count leading spaces (ignore tabs if any)
-        space_count = len(indent.replace('\t', ''))
+        space_count = len(indent) - indent.count('\t')
 
         # Convert based on indent_unit
         # If indent_unit is 2: 2 spaces = 1 tab, 4 spaces = 2 tabs, etc.
@@ -1745,16 +1982,23 @@ def spaces_to_tabs_for_list(line, indent_unit):
 
     return line
 
-def get_list_indent(line):
-    """Get the indentation level of a list item"""
-    match = re.match(r'^(\s*)', line)
-    return len(match.group(1)) if match else 0
+def _indent_len(line):
+    """Get the length of a line's leading whitespace without copying the rest"""
+    return _RE_LEADING_WS.match(line).end()
+
+def _rstrip_len(line):
+    """Get the length of a line without its trailing whitespace, without copying it"""
+    end = len(line)
+    # Usually only a newline and maybe a few spaces trail a line, so this is short
+    while end and line[end - 1].isspace():
+        end -= 1
+    return end
 
 def get_list_level(indent_str, indent_unit=2):
     """Get the list nesting level (0-based) based on indentation"""
     # Count tabs and spaces
     tab_count = indent_str.count('\t')
-    space_count = len(indent_str.replace('\t', ''))
+    space_count = len(indent_str) - tab_count
     # Convert spaces to equivalent tabs based on indent_unit
     total_indent = tab_count + (space_count // indent_unit)
     return total_indent
@@ -1764,47 +2008,44 @@ def normalize_list_markers(line, list_context_stack, indent_unit=2, skip_list_re
 
     Args:
         line: The list item line to normalize
-        list_context_stack: List of (level, list_type, current_number) tuples tracking list state
+        list_context_stack: List of (level, list_type, current_number) tuples tracking list state,
+            ordered by increasing level; it is updated in place
         indent_unit: Base indentation unit (2 or 4 spaces per tab)
         skip_list_reset: If True, preserve starting number; if False (default), always start at 1
 
     Returns:
         (normalized_line, updated_stack, changed)
     """
-    if not is_list_item(line):
-        return line, list_context_stack, False
-
-    # Require at least one whitespace after list marker to avoid matching emphasis like "*This"
-    match = re.match(r'^(\s*)([-*+]|\d+\.)(\s+)(.*)$', line)
-    if not match:
+    # Split the item (None when this is not a list item)
+    # Requires at least one whitespace after list marker to avoid matching emphasis like "*This"
+    parts = _parse_list_item(line)
+    if not parts:
         return line, list_context_stack, False
 
-    indent = match.group(1)
-    marker = match.group(2)
-    marker_space = match.group(3)
-    content = match.group(4)
+    indent, marker, marker_space, content = parts
 
     # Calculate current level
     current_level = get_list_level(indent, indent_unit)
 
     # Determine if this is a numbered list or bulleted list
-    is_numbered = bool(re.match(r'^\d+\.', marker))
+    is_numbered = marker.endswith('.')
 
     # Update the stack - remove contexts for deeper levels (but keep same or shallower)
     # This allows us to return to previous levels and continue those lists
-    list_context_stack = [ctx for ctx in list_context_stack if ctx[0] <= current_level]
-
-    # Check if we have a context for this exact level
-    matching_context = None
-    for ctx in reversed(list_context_stack):
-        if ctx[0] == current_level:
-            matching_context = ctx
+    # Levels only increase toward the top of the stack, so the deeper ones are all on top
+    while list_context_stack and list_context_stack[-1][0] > current_level:
+        list_context_stack.pop()
+
+    # Check if we have a context for this exact level (remember where it sits)
+    idx = -1
+    for ctx_idx in range(len(list_context_stack) - 1, -1, -1):
+        if list_context_stack[ctx_idx][0] == current_level:
+            idx = ctx_idx
             break
 
-    if matching_context:
+    if idx >= 0:
         # Continue existing list at this level
-        level, list_type, current_number = matching_context
-        idx = list_context_stack.index(matching_context)
+        level, list_type, current_number = list_context_stack[idx]
 
         if list_type == 'numbered':
             # Continue numbering
@@ -1862,15 +2103,22 @@ def is_blockquote(line):
 
 def get_blockquote_prefix(line):
     """Get the blockquote prefix (including spaces)"""
-    match = re.match(r'^(\s*)', line)
-    spaces = match.group(1) if match else ''
-    if line.lstrip().startswith('>'):
+    spaces = _RE_LEADING_WS.match(line).group(1)
+    # Test for '>' right after the indent instead of lstripping a copy
+    if line.startswith('>', len(spaces)):
         return spaces + '>'
     return ''
 
+# First characters that can start a line should_preserve_line keeps: fences,
+# headers, horizontal rules and reference definitions
+_PRESERVE_LINE_STARTS = ('`', '~', '#', '-', '*', '_', '[')
+
 def should_preserve_line(line):
     """Check if line should not be wrapped (code blocks, headers, etc.)"""
-    stripped = line.strip()
+    stripped = line.lstrip()
+    # Plain paragraph text fails this single check
+    if not stripped.startswith(_PRESERVE_LINE_STARTS):
+        return False
     # Fenced code blocks
     if is_code_block(line):
         return True
@@ -1882,7 +2130,7 @@ def should_preserve_line(line):
         return True
     # Reference-style link definitions should never be wrapped
     # e.g. [1]: https://example.com "Title"
-    if re.match(r'^\[[^\]]+\]\s*:\s*\S+', stripped):
+    if stripped.startswith('[') and _RE_REF_DEF_LINE.match(stripped):
         return True
     # Note: blank lines are NOT preserved here - they go through blank line compression
     return False
@@ -1973,59 +2221,58 @@ def wrap_text(text, width, prefix=''):
         return [full_first_line]
 
     # Don't wrap if it contains a long link or code span
-    if re.search(r'\[.*?\]\([^)]{20,}\)', text):
+    if _RE_LONG_LINK.search(text):
         return [full_first_line]
-    if re.search(r'`[^`]{20,}`', text):
+    if _RE_LONG_CODE_SPAN.search(text):
         return [full_first_line]
 
     words = tokenize_for_wrap(text)
     lines = []
-    current_line = prefix
-
-    for i, word in enumerate(words):
+    # Words on the current line (joined by single spaces after the prefix) and
+    # the length that line would have, so fitting a word is integer arithmetic
+    # rather than building a candidate string per word
+    current_words = []
+    prefix_len = len(prefix)
+    current_len = prefix_len
+
+    for word in words:
         # Check if adding this word would exceed width
-        test_line = current_line + (' ' if current_line != prefix else '') + word
-        if len(test_line) <= width:
-            current_line = test_line
-        else:
-            # Check if this word starts with a number and period (e.g., "3.")
-            # If so, we should also wrap the previous word to avoid creating a false list item
-            if re.match(r'^\d+\.', word) and current_line != prefix:
-                # Extract the last word from current_line (after prefix)
-                current_content = current_line[len(prefix):].strip()
-                if current_content:
-                    # Split to get the last word
-                    current_words = current_content.split()
-                    if len(current_words) > 0:
-                        last_word = current_words[-1]
-                        # Remove last word from current_line
-                        current_line_without_last = current_line.rsplit(' ' + last_word, 1)[0]
-                        if current_line_without_last == prefix:
-                            current_line_without_last = prefix
-                        # Start new line with both the previous word and the number+period word
-                        if current_line_without_last != prefix:
-                            lines.append(current_line_without_last)
-                        current_line = prefix + last_word + ' ' + word
-                    else:
-                        if current_line != prefix:
-                            lines.append(current_line)
-                        current_line = prefix + word
-                else:
-                    if current_line != prefix:
-                        lines.append(current_line)
-                    current_line = prefix + word
-            else:
-                if current_line != prefix:
-                    lines.append(current_line)
-                current_line = prefix + word
+        test_len = current_len + (1 if current_words else 0) + len(word)
+        if test_len <= width:
+            current_words.append(word)
+            current_len = test_len
+            continue
+
+        # Check if this word starts with a number and period (e.g., "3.")
+        # If so, we should also wrap the previous word to avoid creating a false list item
+        if _RE_NUMBERED_MARKER.match(word) and current_words:
+            current_line = prefix + ' '.join(current_words)
+            # Extract the last word from current_line (after prefix)
+            current_content = current_line[prefix_len:].strip()
+            if current_content:
+                # Split to get the last word
+                last_word = current_content.split()[-1]
+                # Remove last word from current_line
+                current_line_without_last = current_line.rsplit(' ' + last_word, 1)[0]
+                # Start new line with both the previous word and the number+period word
+                if current_line_without_last != prefix:
+                    lines.append(current_line_without_last)
+                current_words = [last_word, word]
+                current_len = prefix_len + len(last_word) + 1 + len(word)
+                continue
 
-    if current_line != prefix:
-        lines.append(current_line)
+        if current_words:
+            lines.append(prefix + ' '.join(current_words))
+        current_words = [word]
+        current_len = prefix_len + len(word)
+
+    if current_words:
+        lines.append(prefix + ' '.join(current_words))
 
     return lines if lines else [full_first_line]
 
 # Define linting rules (numbered for --skip flag)
-LINTING_RULES = {
+LINTING_RULES = MappingProxyType({
     1: ("Normalize line endings to Unix", "line-endings"),
     2: ("Trim trailing whitespace (preserve exactly 2 spaces)", "trailing"),
     3: ("Collapse multiple blank lines (max 1 consecutive)", "blank-lines"),
@@ -2057,12 +2304,35 @@ LINTING_RULES = {
     29: ("Place link definitions at the end of the document (if skipped and reference-links enabled, places at beginning)", "links-at-end"),
     30: ("Convert links to inline format (overrides reference-links if enabled)", "inline-links"),
     31: ("Normalize Liquid tag spacing", "liquid-tags"),
-}
-
-# Create keyword to rule number mapping
-KEYWORD_TO_RULE = {desc[1]: num for num, desc in LINTING_RULES.items()}
-# Add alias for emphasis
-KEYWORD_TO_RULE['emphasis'] = 25
+})
+
+# Create keyword to rule number mapping (read-only, like LINTING_RULES)
+KEYWORD_TO_RULE = MappingProxyType({
+    **{desc[1]: num for num, desc in LINTING_RULES.items()},
+    # Add alias for emphasis
+    'emphasis': 25,
+})
+
+# Group keywords that map to multiple underlying rules
+RULE_GROUP_KEYWORDS = MappingProxyType({
+    # Both before/after code block rules
+    'code-block-newlines': frozenset({6, 7}),
+    # Display math block spacing and surrounding newlines
+    'display-math-newlines': frozenset({21}),
+})
+
+# Every config keyword (single-rule or group) mapped to the rules it names
+_KEYWORD_TO_RULES = MappingProxyType({
+    **{keyword: frozenset({num}) for keyword, num in KEYWORD_TO_RULE.items()},
+    **RULE_GROUP_KEYWORDS,
+})
+
+# Skip keywords that narrow a rule instead of disabling it; process_file
+# reads them from the raw skip string
+SKIP_SUB_KEYWORDS = frozenset({'em-dash', 'guillemet'})
+
+# Listed when --skip is given an unknown keyword
+_VALID_KEYWORDS_MSG = ', '.join(sorted(KEYWORD_TO_RULE) + sorted(SKIP_SUB_KEYWORDS) + list(RULE_GROUP_KEYWORDS))
 
 def get_top_level_element_end(lines, start_idx):
     """Find the end of a top-level element (paragraph, list, etc.)
@@ -2086,7 +2356,7 @@ def get_top_level_element_end(lines, start_idx):
 
     # List item - find end of top-level list
     if is_list_item(line):
-        current_indent = len(line) - len(line.lstrip())
+        current_indent = _indent_len(line)
 
         # If nested, find top-level list start
         if current_indent > 0:
@@ -2098,7 +2368,7 @@ def get_top_level_element_end(lines, start_idx):
                 if not is_list_item(prev_line):
                     top_level_start = i + 1
                     break
-                prev_indent = len(prev_line) - len(prev_line.lstrip())
+                prev_indent = _indent_len(prev_line)
                 if prev_indent == 0:
                     top_level_start = i
                     break
@@ -2115,7 +2385,7 @@ def get_top_level_element_end(lines, start_idx):
                 # Blank line - check if list continues
                 if i + 1 < len(lines) and is_list_item(lines[i + 1]):
                     next_line = lines[i + 1]
-                    next_indent = len(next_line) - len(next_line.lstrip())
+                    next_indent = _indent_len(next_line)
                     if next_indent == 0:
                         i += 1
                         continue
@@ -2124,14 +2394,14 @@ def get_top_level_element_end(lines, start_idx):
                 return last_top_level_item
 
             if is_list_item(current):
-                current_indent = len(current) - len(current.lstrip())
+                current_indent = _indent_len(current)
                 if current_indent == 0:
                     last_top_level_item = i
                 i += 1
                 continue
 
             # Non-list line - check if indented continuation
-            if current.strip().startswith('\t') or (current.strip().startswith(' ') and len(current) - len(current.lstrip()) > 0):
+            if current.strip().startswith('\t') or (current.strip().startswith(' ') and _indent_len(current) > 0):
                 i += 1
                 continue
 
@@ -2162,13 +2432,98 @@ def get_top_level_element_end(lines, start_idx):
         current = lines[i]
         if not current.strip():
             return i - 1
-        if (is_headline(current) or is_list_item(current) or
-            is_code_block(current) or is_horizontal_rule(current) or
-            is_blockquote(current)):
+        if classify_line(current) is not None:
             return i - 1
         i += 1
     return len(lines) - 1
 
+def _build_code_span_mask(line):
+    """Map each position of a line to whether it falls inside a code span
+
+    Returns a bytearray with one entry per position (plus one for the end of
+    the line) that is 1 when an odd number of unescaped backticks precede it.
+    """
+    length = len(line)
+    mask = bytearray(length + 1)
+    inside = 0
+    i = 0
+    while i < length:
+        mask[i] = inside
+        char = line[i]
+        if char == '\\':
+            # Escaped character never toggles the state
+            if i + 1 < length:
+                mask[i + 1] = inside
+            i += 2
+            continue
+        if char == '`':
+            inside ^= 1
+        i += 1
+    mask[length] = inside
+    return mask
+
+def _splice_replacements(line, edits):
+    """Apply (start, end, replacement) edits, sorted by start, to a line
+
+    Disjoint edits are stitched together in one pass. If any edits overlap,
+    they are applied one at a time from right to left instead, each to the
+    result of the previous one.
+    """
+    pieces = []
+    cursor = 0
+    for start, end, replacement in edits:
+        if start < cursor:
+            break
+        pieces.append(line[cursor:start])
+        pieces.append(replacement)
+        cursor = end
+    else:
+        pieces.append(line[cursor:])
+        return ''.join(pieces)
+
+    for start, end, replacement in reversed(edits):
+        line = line[:start] + replacement + line[end:]
+    return line
+
+def _restore_list_structure(line, new_line):
+    """Return new_line with the list structure of line restored if it was lost
+
+    If the original line was a list item and the rewritten one isn't any more,
+    or uses a different marker or indent, the original indent, marker and
+    spacing are put back in front of the rewritten content.
+    """
+    orig_parts = _parse_list_item(line)
+    if not orig_parts:
+        return new_line
+    orig_indent, orig_marker, orig_marker_space, orig_content = orig_parts
+    prefix = orig_indent + orig_marker + orig_marker_space
+
+    new_parts = _parse_list_item(new_line)
+    if new_parts:
+        if new_parts[0] == orig_indent and new_parts[1] == orig_marker:
+            # Still the same list item
+            return new_line
+        # Marker or indentation changed - keep the content, restore the rest
+        new_content = new_parts[3]
+    else:
+        # The replacement completely broke the list structure. If new_line
+        # is shorter than the original prefix (or has nothing after it), the
+        # marker is missing and new_line is likely just the content;
+        # otherwise the content follows where the prefix used to end
+        marker_end_pos = len(prefix)
+        if len(new_line) < marker_end_pos or not new_line[marker_end_pos:].lstrip():
+            new_content = new_line.lstrip()
+        else:
+            new_content = new_line[marker_end_pos:].lstrip()
+        # Remove any marker that might be left at the start
+        new_content = _RE_STRAY_LIST_MARKER.sub('', new_content).lstrip()
+
+    new_line = prefix + new_content
+    # Preserve newline if original had one
+    if line.endswith('\n') and not new_line.endswith('\n'):
+        new_line += '\n'
+    return new_line
+
 def convert_links_in_document(lines, use_inline, use_reference, place_at_beginning):
     """Convert all links in the document using approach similar to formd gist
 
@@ -2177,24 +2532,19 @@ def convert_links_in_document(lines, use_inline, use_reference, place_at_beginni
     if not use_inline and not use_reference:
         return lines
 
-    # Make a copy to avoid modifying the original during iteration
-    lines = list(lines)
-
-    # First, collect all existing reference definitions
-    # Pattern: [id]: url or [id]: url "title"
-    ref_def_pattern = re.compile(r'^(\[[^\]]+\])\s*:\s*(.+)$')
+    # First, collect all existing reference definitions (_RE_LINK_REF_DEF)
     ref_definitions = {}  # Maps ref_id -> (url, title)
-    ref_def_lines = []
+    ref_def_lines = set()
 
     for i, line in enumerate(lines):
         stripped = line.strip()
-        match = ref_def_pattern.match(stripped)
+        match = _RE_LINK_REF_DEF.match(stripped)
         if match:
             ref_id = match.group(1)
             url_part = match.group(2).strip()
 
             # Extract URL and optional title
-            url_match = re.match(r'^([^\s"]+)(?:\s+"([^"]+)")?$', url_part)
+            url_match = _RE_LINK_DESTINATION.match(url_part)
             if url_match:
                 url = url_match.group(1)
                 title = url_match.group(2) if url_match.group(2) else None
@@ -2209,42 +2559,29 @@ def convert_links_in_document(lines, use_inline, use_reference, place_at_beginni
                 normalized_id = f'[{ref_text}]'
                 if normalized_id != ref_id:
                     ref_definitions[normalized_id] = (url, title)
-            ref_def_lines.append(i)
+            ref_def_lines.add(i)
+
+    # Remove reference definition lines in one pass; this also gives us a
+    # fresh list to modify without touching the caller's
+    lines = [line for i, line in enumerate(lines) if i not in ref_def_lines]
 
-    # Remove reference definition lines
-    for line_idx in reversed(ref_def_lines):
-        lines.pop(line_idx)
+    # Map each lowercased definition key to the first ID (without brackets)
+    # defined with that spelling, for case-insensitive implicit link lookups
+    ref_ids_by_lower = {}
+    for def_ref_id in ref_definitions:
+        ref_ids_by_lower.setdefault(def_ref_id.lower(), def_ref_id[1:-1])
 
-    # Now find all links in the document
-    # Pattern similar to gist: [text][ref] or [text](url)
-    match_links = re.compile(r'(\[.*?\])\s?(\[.*?\]|\(.*?\))', re.DOTALL)
+    # Now find all links in the document: [text](url), [text][ref] and [text]
 
     # Track code block state
     in_code_block = False
 
-    # Helper to check if position is in code span
-    def is_in_code_span(text, pos):
-        before = text[:pos]
-        backticks = 0
-        i = 0
-        while i < len(before):
-            if before[i] == '`':
-                backticks += 1
-                while i + 1 < len(before) and before[i + 1] == '`':
-                    i += 1
-                    backticks += 1
-                i += 1
-            elif before[i] == '\\':
-                i += 2
-            else:
-                i += 1
-        return backticks % 2 == 1
-
     # Collect all links with their positions and URLs
     # link_data format: (line_idx, match_start, match_end, link_text, url, title, link_type, ref_id)
     # link_type: 'inline', 'reference', 'implicit'
     # ref_id: original reference ID (for 'reference' and 'implicit' types), None for 'inline'
     link_data = []
+    add_link = link_data.append  # bound once for the per-line match loops
 
     for i, line in enumerate(lines):
         # Track code blocks
@@ -2255,25 +2592,23 @@ def convert_links_in_document(lines, use_inline, use_reference, place_at_beginni
         if in_code_block:
             continue
 
-        # Track positions we've already matched to avoid duplicates
-        matched_positions = set()
+        # Spans of the inline and reference links recorded on this line
+        link_spans = []
+
+        # Code span state for every position, computed once per line
+        in_code_span = _build_code_span_mask(line)
 
         # Find inline links: [text](url) or [text](url "title")
-        inline_pattern = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
-        for match in inline_pattern.finditer(line):
-            if is_in_code_span(line, match.start()):
+        for match in _RE_INLINE_LINK.finditer(line):
+            if in_code_span[match.start()]:
                 continue
-            # Check if this position overlaps with a previously matched link
-            pos_key = (i, match.start(), match.end())
-            if pos_key in matched_positions:
-                continue
-            matched_positions.add(pos_key)
+            link_spans.append(match.span())
 
             link_text = match.group(1)
             url_part = match.group(2)
 
             # Extract URL and title
-            url_match = re.match(r'^([^\s"]+)(?:\s+"([^"]+)")?$', url_part)
+            url_match = _RE_LINK_DESTINATION.match(url_part)
             if url_match:
                 url = url_match.group(1)
                 title = url_match.group(2)
@@ -2281,46 +2616,66 @@ def convert_links_in_document(lines, use_inline, use_reference, place_at_beginni
                 url = url_part
                 title = None
 
-            link_data.append((i, match.start(), match.end(), link_text, url, title, 'inline', None))
-
-        # Find reference links: [text][ref]
-        ref_pattern = re.compile(r'\[([^\]]+)\]\[([^\]]+)\]')
-        for match in ref_pattern.finditer(line):
-            if is_in_code_span(line, match.start()):
+            # Repeated links then share one string object, so the (url, title)
+            # lookups in url_to_ref compare by identity instead of char by char
+            url = sys.intern(url)
+            if title is not None:
+                title = sys.intern(title)
+
+            add_link((i, match.start(), match.end(), link_text, url, title, 'inline', None))
+
+        # Find reference links [text][ref] and implicit reference links [text] in
+        # one pass. An implicit link can never start inside a reference link's
+        # first brackets, so a match of either shape hides no match of the other;
+        # implicit links nested in an inline link are skipped below. Record them
+        # per line as all reference links, then all implicit links.
+        implicit_matches = []
+        for match in _RE_REFERENCE_OR_IMPLICIT_LINK.finditer(line):
+            ref_id = match.group(2)
+            if ref_id is None:
+                implicit_matches.append(match)
                 continue
-            # Check if this position overlaps with a previously matched link
-            pos_key = (i, match.start(), match.end())
-            if pos_key in matched_positions:
+            if in_code_span[match.start()]:
+                # A skipped reference link doesn't cover its [ref] part, which
+                # can still stand as an implicit link of its own
+                implicit_match = _RE_IMPLICIT_LINK.match(line, match.start(2) - 1)
+                if implicit_match:
+                    implicit_matches.append(implicit_match)
                 continue
-            matched_positions.add(pos_key)
+            link_spans.append(match.span())
 
             link_text = match.group(1)
-            ref_id = match.group(2)
 
             # Look up URL from definitions
             ref_key = f'[{ref_id}]'
             if ref_key in ref_definitions:
                 url, title = ref_definitions[ref_key]
                 # Preserve existing reference links with their original ID
-                link_data.append((i, match.start(), match.end(), link_text, url, title, 'reference', ref_id))
+                add_link((i, match.start(), match.end(), link_text, url, title, 'reference', ref_id))
             else:
                 # Reference link without definition - treat as inline and convert
                 # This shouldn't normally happen, but handle it gracefully
-                link_data.append((i, match.start(), match.end(), link_text, None, None, 'inline', None))
+                add_link((i, match.start(), match.end(), link_text, None, None, 'inline', None))
+
+        # Merge the recorded spans into sorted, disjoint ranges (inline and
+        # reference links may overlap each other) so coverage is one bisect
+        covered_starts = []
+        covered_ends = []
+        for span_start, span_end in sorted(link_spans):
+            if covered_ends and span_start <= covered_ends[-1]:
+                covered_ends[-1] = max(covered_ends[-1], span_end)
+            else:
+                covered_starts.append(span_start)
+                covered_ends.append(span_end)
 
-        # Find implicit reference links: [text] (without explicit ref)
-        # But only if it's not already part of a reference or inline link we found above
-        implicit_pattern = re.compile(r'\[([^\]]+)\](?![\[\(])')
-        for match in implicit_pattern.finditer(line):
-            if is_in_code_span(line, match.start()):
+        # Implicit reference links: [text] (without explicit ref)
+        # But only if it's not already part of a link we found above
+        for match in implicit_matches:
+            if in_code_span[match.start()]:
                 continue
             # Check if this position overlaps with a previously matched link
-            already_covered = False
-            for existing_line_idx, existing_start, existing_end in [(p[0], p[1], p[2]) for p in matched_positions if p[0] == i]:
-                if existing_start <= match.start() < existing_end:
-                    already_covered = True
-                    break
-            if already_covered:
+            covered_idx = bisect.bisect_right(covered_starts, match.start()) - 1
+            if covered_idx >= 0 and match.start() < covered_ends[covered_idx]:
                 continue
 
             link_text = match.group(1)
@@ -2328,78 +2683,68 @@ def convert_links_in_document(lines, use_inline, use_reference, place_at_beginni
 
             if ref_id_normalized in ref_definitions:
                 url, title = ref_definitions[ref_id_normalized]
-                pos_key = (i, match.start(), match.end())
-                matched_positions.add(pos_key)
                 # Preserve implicit reference links - use the normalized ID as the ref_id
                 # Find the actual ref_id that was used in definitions (might be different case)
-                actual_ref_id = None
-                for def_ref_id in ref_definitions.keys():
-                    if def_ref_id.lower() == ref_id_normalized.lower():
-                        actual_ref_id = def_ref_id[1:-1]  # Remove brackets
-                        break
-                if actual_ref_id is None:
-                    actual_ref_id = link_text.lower().strip()
-                link_data.append((i, match.start(), match.end(), link_text, url, title, 'implicit', actual_ref_id))
+                actual_ref_id = ref_ids_by_lower.get(ref_id_normalized.lower(), ref_id_normalized[1:-1])
+                add_link((i, match.start(), match.end(), link_text, url, title, 'implicit', actual_ref_id))
 
     # Convert links based on mode
     if use_inline:
-        # Convert all to inline format (process in reverse to maintain positions)
-        link_data_reversed = sorted(link_data, key=lambda x: (x[0], x[1]), reverse=True)
-        for link_item in link_data_reversed:
+        # Convert all to inline format, grouping the replacements by line
+        edits_by_line = {}
+        for link_item in link_data:
             line_idx, start, end, link_text, url, title, link_type, ref_id = link_item
             if not url:  # Skip if no URL
                 continue
-            line = lines[line_idx]
             if title:
                 replacement = f'[{link_text}]({url} "{title}")'
             else:
                 replacement = f'[{link_text}]({url})'
-            lines[line_idx] = line[:start] + replacement + line[end:]
+            edits_by_line.setdefault(line_idx, []).append((start, end, replacement))
+
+        for line_idx, edits in edits_by_line.items():
+            edits.sort(key=lambda x: x[0])
+            lines[line_idx] = _splice_replacements(lines[line_idx], edits)
 
     elif use_reference:
         # Track text-based reference IDs and their URLs (for preserving existing refs)
+        # A dict keeps its keys in first-seen order, so it also gives the document
+        # order of the refs without a separate list to search
         text_ref_to_url = {}  # Maps ref_id -> (url, title)
-        # Track which text-based refs we've seen in the document (for ordering)
-        text_ref_order = []  # List of ref_ids in document order
 
         # Track numeric references for inline links only
         url_to_ref = {}  # Maps (url, title) -> ref_num
-        next_ref = 1
 
         # First pass: collect text-based reference IDs (including numeric ones)
         for link_item in link_data:
             line_idx, start, end, link_text, url, title, link_type, ref_id = link_item
 
-            if link_type == 'reference':
-                # Preserve existing reference links - track their ID and URL
-                if ref_id and url:  # Only if we have both
-                    text_ref_to_url[ref_id] = (url, title)
-                    if ref_id not in text_ref_order:
-                        text_ref_order.append(ref_id)
-            elif link_type == 'implicit':
-                # Preserve implicit reference links - track their ID and URL
+            if link_type == 'reference' or link_type == 'implicit':
+                # Preserve existing and implicit reference links - track their ID and URL
                 if ref_id and url:  # Only if we have both
                     text_ref_to_url[ref_id] = (url, title)
-                    if ref_id not in text_ref_order:
-                        text_ref_order.append(ref_id)
 
         # Determine the highest numeric ID used in text-based references
         # This ensures we don't duplicate numeric IDs when assigning to inline links
         used_numeric_ids = set()
         for ref_id in text_ref_to_url.keys():
             # Check if ref_id is a numeric string (like "1", "2", etc.)
-            try:
-                num_id = int(ref_id)
-                used_numeric_ids.add(num_id)
-            except ValueError:
-                # Not a numeric ID, ignore
-                pass
+            if ref_id.isdecimal():
+                used_numeric_ids.add(int(ref_id))
+            elif any(char.isdecimal() for char in ref_id):
+                # Only IDs with a digit can still be something int() accepts
+                # (" 1", "+1", "1_000"), so only they pay for the exception
+                try:
+                    used_numeric_ids.add(int(ref_id))
+                except ValueError:
+                    # Not a numeric ID, ignore
+                    pass
 
         # Find the next available numeric ID (must be higher than any existing numeric ID)
-        if used_numeric_ids:
-            next_ref = max(used_numeric_ids) + 1
+        next_ref = max(used_numeric_ids, default=0) + 1
 
-        # Second pass: assign numeric references to inline links (skipping used numbers)
+        # Second pass: assign numeric references to inline links. Every used
+        # number is below next_ref and it only counts up, so none is ever taken.
         for link_item in link_data:
             line_idx, start, end, link_text, url, title, link_type, ref_id = link_item
 
@@ -2408,11 +2753,7 @@ def convert_links_in_document(lines, use_inline, use_reference, place_at_beginni
                 if url:  # Only if we have a URL
                     url_key = (url, title)
                     if url_key not in url_to_ref:
-                        # Make sure we don't use a number that's already taken
-                        while next_ref in used_numeric_ids:
-                            next_ref += 1
                         url_to_ref[url_key] = next_ref
-                        used_numeric_ids.add(next_ref)
                         next_ref += 1
 
         # Replace links (process in reverse to maintain positions)
@@ -2432,20 +2773,13 @@ def convert_links_in_document(lines, use_inline, use_reference, place_at_beginni
 
         for line_idx in sorted(links_by_line.keys(), reverse=True):
             line = lines[line_idx]
-            # Sort by start position, descending (right to left)
-            line_links = sorted(links_by_line[line_idx], key=lambda x: x[0], reverse=True)
+            # Sort by start position; seen_links already dropped duplicate ranges
+            line_links = sorted(links_by_line[line_idx], key=lambda x: x[0])
 
-            # Build new line by replacing from right to left
-            # This ensures positions don't shift as we replace
-            replaced_ranges = set()  # Track (start, end) ranges we've replaced
-            new_line = line
+            # Collect the replacements and build the new line from them at once
+            edits = []
             for link_item in line_links:
                 start, end, link_text, url, title, link_type, ref_id = link_item
-                # Skip if we've already replaced this exact range (avoid duplicates)
-                range_key = (start, end)
-                if range_key in replaced_ranges:
-                    continue
-                replaced_ranges.add(range_key)
 
                 if link_type == 'reference' and ref_id:
                     # Preserve existing reference link
@@ -2462,62 +2796,14 @@ def convert_links_in_document(lines, use_inline, use_reference, place_at_beginni
                     # Skip links without valid data
                     continue
 
-                # Replace from right to left to maintain positions
-                new_line = new_line[:start] + replacement + new_line[end:]
-
-            # Verify that if the original line was a list item, the new line is still a list item
-            # This ensures we don't break list structure during link conversion
-            if is_list_item(line):
-                # Extract the list item structure from the original line
-                orig_match = re.match(r'^(\s*)([-*+]|\d+\.)(\s+)(.*)$', line)
-                if orig_match:
-                    orig_indent = orig_match.group(1)
-                    orig_marker = orig_match.group(2)
-                    orig_marker_space = orig_match.group(3)
-                    orig_content = orig_match.group(4)
-
-                    # Check if the new line is still a valid list item
-                    new_match = re.match(r'^(\s*)([-*+]|\d+\.)(\s+)(.*)$', new_line)
-                    if not new_match:
-                        # The replacement completely broke the list structure - reconstruct it
-                        # The new_line should have the same content but with links replaced
-                        # We need to extract just the content (without marker/indent) from new_line
-                        # Try to find where the original content started
-                        marker_end_pos = len(orig_indent) + len(orig_marker) + len(orig_marker_space)
-
-                        # If new_line is shorter than marker_end_pos, it means the marker is missing
-                        # In that case, new_line should just be the content
-                        if len(new_line) < marker_end_pos or not new_line[marker_end_pos:].lstrip():
-                            # Marker is missing - new_line is likely just the content
-                            new_content = new_line.lstrip()
-                            # Remove any marker that might be at the start
-                            new_content = re.sub(r'^[-*+]|\d+\.\s*', '', new_content).lstrip()
-                        else:
-                            # Marker might still be there, extract content after it
-                            new_content = new_line[marker_end_pos:].lstrip()
-                            # If there's still a marker in the content, remove it
-                            new_content = re.sub(r'^[-*+]|\d+\.\s*', '', new_content).lstrip()
-
-                        # Reconstruct the line with original structure
-                        new_line = orig_indent + orig_marker + orig_marker_space + new_content
-                        # Preserve newline if original had one
-                        if line.endswith('\n') and not new_line.endswith('\n'):
-                            new_line += '\n'
-                    elif new_match.group(2) != orig_marker:
-                        # Marker changed - restore original marker
-                        new_content = new_match.group(4)
-                        new_line = orig_indent + orig_marker + orig_marker_space + new_content
-                        if line.endswith('\n') and not new_line.endswith('\n'):
-                            new_line += '\n'
-                    else:
-                        # New line is still a valid list item, but verify indentation
-                        new_indent = new_match.group(1)
-                        if orig_indent != new_indent:
-                            # Restore original indentation
-                            new_content = new_match.group(4)
-                            new_line = orig_indent + orig_marker + orig_marker_space + new_content
-                            if line.endswith('\n') and not new_line.endswith('\n'):
-                                new_line += '\n'
+                edits.append((start, end, replacement))
+
+            new_line = _splice_replacements(line, edits)
+
+            # Make sure the rewrite didn't break the line's list structure (an
+            # unchanged line can't have, so only check changed ones)
+            if new_line != line:
+                new_line = _restore_list_structure(line, new_line)
 
             lines[line_idx] = new_line
 
@@ -2541,17 +2827,17 @@ def convert_links_in_document(lines, use_inline, use_reference, place_at_beginni
                 insert_pos += 1
 
             # Add text-based reference definitions first (in document order)
-            for ref_id in text_ref_order:
-                url, title = text_ref_to_url[ref_id]
+            for ref_id, (url, title) in text_ref_to_url.items():
                 if title:
                     lines.insert(insert_pos, f'[{ref_id}]: {url} "{title}"\n')
                 else:
                     lines.insert(insert_pos, f'[{ref_id}]: {url}\n')
                 insert_pos += 1
 
-            # Add numeric reference definitions next (in order)
+            # Add numeric reference definitions next (numbers were assigned in
+            # insertion order, so the dict already iterates in numeric order)
             if url_to_ref:
-                for (url, title), ref_num in sorted(url_to_ref.items(), key=lambda x: x[1]):
+                for (url, title), ref_num in url_to_ref.items():
                     if title:
                         lines.insert(insert_pos, f'[{ref_num}]: {url} "{title}"\n')
                     else:
@@ -2570,16 +2856,16 @@ def convert_links_in_document(lines, use_inline, use_reference, place_at_beginni
                 lines.append('\n')
 
             # Add text-based reference definitions first (in document order)
-            for ref_id in text_ref_order:
-                url, title = text_ref_to_url[ref_id]
+            for ref_id, (url, title) in text_ref_to_url.items():
                 if title:
                     lines.append(f'[{ref_id}]: {url} "{title}"\n')
                 else:
                     lines.append(f'[{ref_id}]: {url}\n')
 
-            # Add numeric reference definitions next (in order)
+            # Add numeric reference definitions next (numbers were assigned in
+            # insertion order, so the dict already iterates in numeric order)
             if url_to_ref:
-                for (url, title), ref_num in sorted(url_to_ref.items(), key=lambda x: x[1]):
+                for (url, title), ref_num in url_to_ref.items():
                     if title:
                         lines.append(f'[{ref_num}]: {url} "{title}"\n')
                     else:
@@ -2587,19 +2873,28 @@ def convert_links_in_document(lines, use_inline, use_reference, place_at_beginni
 
     return lines
 
-def process_file(filepath, wrap_width, overwrite=False, skip_rules=None, skip_string=None, reverse_emphasis=False):
-    """Process a single markdown file
+def _normalize_newlines(data):
+    """Convert CRLF and lone CR line endings in raw file bytes to LF"""
+    return data.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+
+# Lines process_file inserts to split a list whose marker type changes
+_LIST_INTERRUPTION = ('\n', '<!-- -->\n', '\n')
+
+def _split_lines(text):
+    """Split text into lines that keep their trailing newline"""
+    # Split on \n only (str.splitlines would also break on form feeds, U+2028, etc.)
+    lines = text.split('\n')
+    last_line = lines.pop()
+    lines = [line + '\n' for line in lines]
+    if last_line:
+        lines.append(last_line)
+    return lines
 
-    Args:
-        filepath: Path to the markdown file
-        wrap_width: Width to wrap text at
-        overwrite: If True, overwrite the file. If False, output to STDOUT.
-        skip_rules: Set of rule numbers to skip
-        skip_string: Original skip string (for checking sub-keywords like em-dash, guillemet)
-        reverse_emphasis: If True, reverse emphasis markers (__ → ** for bold, * → _ for italic)
+def _fix_lines(lines, wrap_width, skip_rules, skip_string, reverse_emphasis, line_endings_changed=False):
+    """Run every enabled rule over a document's lines
 
     Returns:
-        True if changes were made, False otherwise
+        tuple of (list of output lines, True if changes were made)
     """
     if skip_rules is None:
         skip_rules = set()
@@ -2607,19 +2902,10 @@ def process_file(filepath, wrap_width, overwrite=False, skip_rules=None, skip_st
     # Check for sub-keywords in skip_string
     skip_em_dash = skip_string and 'em-dash' in skip_string
     skip_guillemet = skip_string and 'guillemet' in skip_string
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-    except Exception as e:
-        print(f"Error reading {filepath}: {e}", file=sys.stderr)
-        return False
 
     # Process link conversions (rules 28, 29, 30) BEFORE wrapping.
     # Converting inline -> reference links can drastically shorten lines; wrapping first can produce
     # unnecessarily short lines.
-    if skip_rules is None:
-        skip_rules = set()
-
     # Use a copy so link-rule bookkeeping doesn't affect the main pass
     link_skip_rules = set(skip_rules)
 
@@ -2645,35 +2931,40 @@ def process_file(filepath, wrap_width, overwrite=False, skip_rules=None, skip_st
         # Even if conversion results in the same output, we don't want to force a rewrite.
         # `changes_made` will be updated naturally by later passes if needed.
 
+    # Classify every line once up front; look-ahead checks reuse these
+    line_kinds = [classify_line(line) for line in lines]
+
     output = []
     in_code_block = False
     in_math_block = False  # Track if we're inside a display math block ($$...$$)
     i = 0
-    changes_made = False
+    # Normalize line endings to Unix (\n): CRLF/CR were already converted on read
+    changes_made = line_endings_changed and 1 not in skip_rules
     consecutive_blank_lines = 0
     current_list_indent_unit = None  # Cache the indent unit for the current list block
     list_context_stack = []  # Track list nesting: [(level, type, number), ...]
 
+    # IAL (16) and Liquid tag (31) spacing run together outside code spans
+    brace_substitutions = []
+    if 16 not in skip_rules:
+        brace_substitutions.append((_RE_IAL, _normalize_ial_match))
+    if 31 not in skip_rules:
+        brace_substitutions.append((_RE_LIQUID, _normalize_liquid_match))
+
     while i < len(lines):
         line = lines[i]
         original_line = line
 
-        # Normalize line endings to Unix (\n)
+        # Normalize line endings to Unix (\n): terminate the final line
         if 1 not in skip_rules:
-            if line.endswith('\r\n'):
-                line = line[:-2] + '\n'
-                changes_made = True
-            elif line.endswith('\r'):
-                line = line[:-1] + '\n'
-                changes_made = True
-            elif not line.endswith('\n'):
+            if not line.endswith('\n'):
                 line = line + '\n'
                 changes_made = True
 
         stripped = line.strip()
 
-        # Track code block state
-        if is_code_block(line):
+        # Track code block state (terminating the line above doesn't change its kind)
+        if line_kinds[i] == 'fence':
             # Normalize fenced code block language identifier spacing
             if 17 not in skip_rules:
                 normalized_code = normalize_fenced_code_lang(line)
@@ -2719,44 +3010,41 @@ def process_file(filepath, wrap_width, overwrite=False, skip_rules=None, skip_st
             i += 1
             continue
 
-        # Normalize emoji names (spellcheck and correct)
-        if 23 not in skip_rules:
+        # Each pass below is skipped when the line lacks the characters it works on
+
+        # Normalize emoji names (spellcheck and correct); names sit between colons
+        if 23 not in skip_rules and ':' in line:
             if not in_math_block:
                 normalized_emoji = normalize_emoji_names(line)
                 if normalized_emoji != line:
                     line = normalized_emoji
                     changes_made = True
 
-        # Normalize typography (curly quotes, dashes, ellipses, guillemets)
-        if 24 not in skip_rules:
+        # Normalize typography (curly quotes, dashes, ellipses, guillemets); every
+        # character it replaces is non-ASCII, and isascii() is a constant-time check
+        if 24 not in skip_rules and not line.isascii():
             normalized_typography = normalize_typography(line, skip_em_dash=skip_em_dash, skip_guillemet=skip_guillemet)
             if normalized_typography != line:
                 line = normalized_typography
                 changes_made = True
 
         # Normalize bold/italic markers
-        if 25 not in skip_rules:
+        if 25 not in skip_rules and ('*' in line or '_' in line):
             normalized_bold_italic = normalize_bold_italic(line, reverse_emphasis=reverse_emphasis)
             if normalized_bold_italic != line:
                 line = normalized_bold_italic
                 changes_made = True
 
-        # Normalize IAL spacing (before other processing)
-        if 16 not in skip_rules:
-            normalized_ial = normalize_ial_spacing(line)
-            if normalized_ial != line:
-                line = normalized_ial
-                changes_made = True
-
-        # Normalize Liquid tag spacing: `{%tag%}` -> `{% tag %}`
-        if 31 not in skip_rules:
-            normalized_liquid = normalize_liquid_tag_spacing(line)
-            if normalized_liquid != line:
-                line = normalized_liquid
+        # Normalize IAL spacing (before other processing), then Liquid tag spacing
+        # (`{%tag%}` -> `{% tag %}`), sharing one code span scan; both need a brace
+        if brace_substitutions and '{' in line:
+            normalized_braces = _sub_outside_code_spans(line, brace_substitutions)
+            if normalized_braces != line:
+                line = normalized_braces
                 changes_made = True
 
-        # Normalize reference-style link definitions
-        if 18 not in skip_rules:
+        # Normalize reference-style link definitions (only ever at the start of the line)
+        if 18 not in skip_rules and line.startswith('['):
             normalized_ref = normalize_reference_link(line)
             if normalized_ref != line:
                 line = normalized_ref
@@ -2826,7 +3114,7 @@ def process_file(filepath, wrap_width, overwrite=False, skip_rules=None, skip_st
                     output.append(line)
                 i += 1
                 continue
-            else:
+            elif '$' in line:
                 # Normalize inline math and single-line display math
                 normalized_math = normalize_math_spacing(line, is_in_code_block=in_code_block)
                 if normalized_math != line:
@@ -2837,7 +3125,8 @@ def process_file(filepath, wrap_width, overwrite=False, skip_rules=None, skip_st
         if 22 not in skip_rules:
             # Detect if we're at the start of a table block
             # A table block starts with a line containing pipes (table row or separator)
-            if '|' in stripped and not is_code_block(line) and not in_math_block:
+            # (fence lines were handled above and never reach this point)
+            if '|' in stripped and not in_math_block:
                 # Collect all consecutive table lines
                 table_lines = []
                 table_start = i
@@ -2853,7 +3142,7 @@ def process_file(filepath, wrap_width, overwrite=False, skip_rules=None, skip_st
                         break
 
                     # Stop if code block delimiter
-                    if is_code_block(current_line):
+                    if line_kinds[j] == 'fence':
                         break
 
                     # Continue if it's a table-related line (has pipes)
@@ -2881,8 +3170,11 @@ def process_file(filepath, wrap_width, overwrite=False, skip_rules=None, skip_st
                         consecutive_blank_lines = 0
                         continue
 
+        # Classify once; the block handlers below don't modify the line before their check
+        line_kind = line_kinds[i] if line is lines[i] else classify_line(line)
+
         # Handle headlines (headers)
-        if is_headline(line):
+        if line_kind == 'headline':
             # Clear list context when encountering a headline (non-list element)
             list_context_stack = []
             current_list_indent_unit = None
@@ -2899,17 +3191,16 @@ def process_file(filepath, wrap_width, overwrite=False, skip_rules=None, skip_st
             if 5 not in skip_rules:
                 if i + 1 < len(lines):
                     next_line = lines[i + 1]
-                    if next_line.strip() and not is_headline(next_line) and not is_code_block(next_line):
-                        # Check if there's already a blank line
-                        if next_line.strip():
-                            output.append('\n')
-                            changes_made = True
+                    # A non-blank next line means there's no blank line yet
+                    if next_line.strip() and line_kinds[i + 1] not in ('headline', 'fence'):
+                        output.append('\n')
+                        changes_made = True
             consecutive_blank_lines = 0
             i += 1
             continue
 
         # Handle horizontal rules
-        if is_horizontal_rule(line):
+        if line_kind == 'rule':
             # Clear list context when encountering a horizontal rule (non-list element)
             list_context_stack = []
             current_list_indent_unit = None
@@ -2936,7 +3227,7 @@ def process_file(filepath, wrap_width, overwrite=False, skip_rules=None, skip_st
             continue
 
         # Handle list items
-        if is_list_item(line):
+        if line_kind == 'list':
             # Normalize task list checkbox (lowercase x)
             if 19 not in skip_rules:
                 normalized_task = normalize_task_checkbox(line)
@@ -2952,43 +3243,41 @@ def process_file(filepath, wrap_width, overwrite=False, skip_rules=None, skip_st
 
             # Check for CommonMark interrupted list: bullet <-> numbered at same level
             # Do this BEFORE normalization so we can detect the original marker types
-            list_indent_before = get_list_indent(line)
-            match_current_orig = re.match(r'^(\s*)([-*+]|\d+\.)(\s+)(.*)$', line)
+            parts_current_orig = _parse_list_item(line)
             interruption_detected = False
-            if match_current_orig and output:
-                current_marker_orig = match_current_orig.group(2)
-                current_is_numbered_orig = bool(re.match(r'^\d+\.', current_marker_orig))
-
-                # Check previous output line (skip blank lines)
-                prev_line = None
-                for j in range(len(output) - 1, -1, -1):
-                    if output[j].strip():
-                        prev_line = output[j]
-                        break
-
-                if prev_line and is_list_item(prev_line):
-                    prev_indent = get_list_indent(prev_line)
-                    match_prev = re.match(r'^(\s*)([-*+]|\d+\.)(\s+)(.*)$', prev_line)
-                    if match_prev:
-                        prev_marker = match_prev.group(2)
-                        prev_is_numbered = bool(re.match(r'^\d+\.', prev_marker))
+            prev_peek = None  # (previous output line, whether it's a list item)
+            if parts_current_orig and output:
+                current_marker_orig = parts_current_orig[1]
+                current_is_numbered_orig = current_marker_orig.endswith('.')
+
+                # Check previous output line (skip blank lines). The walk back only
+                # covers the trailing blank run, which blank-line collapsing keeps short
+                prev_line = next((out for out in reversed(output) if out.strip()), None)
+                prev_is_list = prev_line is not None and is_list_item(prev_line)
+                # Rule 8 below usually peeks at this same line again
+                prev_peek = (prev_line, prev_is_list)
+
+                if prev_is_list:
+                    parts_prev = _parse_list_item(prev_line)
+                    if parts_prev:
+                        prev_marker = parts_prev[1]
+                        prev_is_numbered = prev_marker.endswith('.')
 
                         # If same level and marker type changed (bullet <-> numbered): split the list
                         # BUT only at top-level (level 0) - nested lists should just convert markers
-                        if (prev_indent == list_indent_before and
+                        # (the parsed indents are the list indents, no need to rescan)
+                        if (len(parts_prev[0]) == len(parts_current_orig[0]) and
                             prev_is_numbered != current_is_numbered_orig):
                             if current_list_indent_unit is None:
                                 current_list_indent_unit = detect_list_indent_unit(lines, i)
-                            interrupt_level = get_list_level(match_current_orig.group(1), current_list_indent_unit)
+                            interrupt_level = get_list_level(parts_current_orig[0], current_list_indent_unit)
                             # Only interrupt at top-level (level 0)
                             if interrupt_level == 0:
                                 interruption_detected = True
                                 # Remove context for this level so the new list type starts fresh
                                 list_context_stack = [ctx for ctx in list_context_stack if ctx[0] != interrupt_level]
                                 # Insert: blank line, HTML comment, blank line
-                                output.append('\n')
-                                output.append('<!-- -->\n')
-                                output.append('\n')
+                                output.extend(_LIST_INTERRUPTION)
                                 changes_made = True
 
             # Normalize list markers (renumber ordered lists, standardize bullet markers)
@@ -3023,39 +3312,35 @@ def process_file(filepath, wrap_width, overwrite=False, skip_rules=None, skip_st
                         changes_made = True
                 # If conversion broke the line, keep the original
 
-            list_indent = get_list_indent(line)
-
             # Ensure blank line before list (unless nested or after another list)
             if 8 not in skip_rules:
-                if output and output[-1].strip():
-                    prev_line = output[-1]
-                    # Don't add blank line if previous line is also a list item
-                    if not is_list_item(prev_line):
-                        prev_stripped = prev_line.strip()
+                prev_line = output[-1] if output else ''
+                prev_stripped = prev_line.strip()
+                if prev_stripped:
+                    if prev_peek is not None and prev_peek[0] is prev_line:
+                        prev_is_list = prev_peek[1]
+                    else:
+                        prev_is_list = is_list_item(prev_line)
+                    # Don't add blank line if previous line is also a list item: a nested
+                    # item needs none, and neither does one continuing the same list
+                    if not prev_is_list:
                         if not prev_stripped.startswith('>') and not prev_stripped.startswith('#'):
                             output.append('\n')
                             changes_made = True
-                    else:
-                        # Previous line is a list item - check if this is nested
-                        prev_indent = get_list_indent(prev_line)
-                        # If this item has more indentation than previous, it's nested - no blank line needed
-                        if list_indent <= prev_indent:
-                            # Same or less indentation - might need blank line, but only if not continuing list
-                            pass  # Let it continue without blank line
 
             # Process list item content
-            # Match with or without space after marker
-            # Note: line should always match since we're inside the is_list_item block
-            match = re.match(r'^(\s*)([-*+]|\d+\.)(\s+)(.*)$', line)
-            if not match:
-                # Line should match - if it doesn't, something went wrong in processing
+            # Split the item into indent, marker, marker spacing and content
+            # Note: line should always parse since we're inside the is_list_item block
+            parts = _parse_list_item(line)
+            if not parts:
+                # Line should parse - if it doesn't, something went wrong in processing
                 # Try to recover by checking if it's still a list item
                 if is_list_item(line):
-                    # Still a list item but regex doesn't match - try to fix it
+                    # Still a list item but doesn't parse - try to fix it
                     # Extract what we can from the line
                     stripped = line.lstrip()
                     # Try to find the marker
-                    marker_match = re.match(r'^([-*+]|\d+\.)', stripped)
+                    marker_match = _RE_BARE_LIST_MARKER.match(stripped)
                     if marker_match:
                         marker = marker_match.group(1)
                         # Find where content starts (after marker and optional space)
@@ -3069,9 +3354,9 @@ def process_file(filepath, wrap_width, overwrite=False, skip_rules=None, skip_st
                         line = indent + marker + marker_space + content
                         if not line.endswith('\n') and original_line.endswith('\n'):
                             line += '\n'
-                        # Try the match again
-                        match = re.match(r'^(\s*)([-*+]|\d+\.)(\s+)(.*)$', line)
-                        if not match:
+                        # Try parsing again
+                        parts = _parse_list_item(line)
+                        if not parts:
                             # Still doesn't match - append as-is to avoid data loss
                             output.append(line)
                     else:
@@ -3081,10 +3366,7 @@ def process_file(filepath, wrap_width, overwrite=False, skip_rules=None, skip_st
                     # No longer a list item - this shouldn't happen, but append anyway
                     output.append(line)
             else:
-                indent = match.group(1)
-                marker = match.group(2)
-                marker_space = match.group(3)
-                content = match.group(4)
+                indent, marker, marker_space, content = parts
                 # Normalize: ensure exactly one space after marker
                 if 13 not in skip_rules:
                     if marker_space != ' ':
@@ -3095,65 +3377,41 @@ def process_file(filepath, wrap_width, overwrite=False, skip_rules=None, skip_st
 
                 # Wrap content if needed
                 if 14 not in skip_rules:
-                    if len(line.rstrip()) > wrap_width and content:
+                    if _rstrip_len(line) > wrap_width and content:
                         wrapped = wrap_text(content, wrap_width, prefix)
-                        for j, wrapped_line in enumerate(wrapped):
-                            if j == 0:
-                                # First line already has prefix from wrap_text
-                                output.append(wrapped_line + '\n')
+                        # First line already has prefix from wrap_text
+                        wrapped_out = [wrapped_line + '\n' for wrapped_line in wrapped[:1]]
+                        # Continuation lines need extra indentation to match prefix
+                        # Calculate continuation indent: same as prefix but as spaces
+                        cont_indent = ' ' * len(prefix)
+                        for wrapped_line in wrapped[1:]:
+                            # Remove prefix from wrapped_line (it was added by wrap_text)
+                            if wrapped_line.startswith(prefix):
+                                content_part = wrapped_line[len(prefix):].lstrip()
                             else:
-                                # Continuation lines need extra indentation to match prefix
-                                # Calculate continuation indent: same as prefix but as spaces
-                                cont_indent = ' ' * len(prefix)
-                                # Remove prefix from wrapped_line (it was added by wrap_text)
-                                if wrapped_line.startswith(prefix):
-                                    content_part = wrapped_line[len(prefix):].lstrip()
-                                else:
-                                    content_part = wrapped_line
-                                # Add continuation indent and content
-                                output.append(cont_indent + content_part + '\n')
+                                content_part = wrapped_line
+                            # Add continuation indent and content
+                            wrapped_out.append(cont_indent + content_part + '\n')
+                        output.extend(wrapped_out)
                         changes_made = True
                     else:
                         output.append(line)
                 else:
                     output.append(line)
 
-            # Ensure blank line after list (unless next line is also a list or nested)
-            if 9 not in skip_rules:
-                if i + 1 < len(lines):
-                    next_line = lines[i + 1]
-                    if next_line.strip() and not is_list_item(next_line):
-                        # Next line is not a list item - reset indent unit cache and list context for next list
-                        current_list_indent_unit = None
-                        list_context_stack = []
-                        next_indent = get_list_indent(next_line) if next_line.strip() else 0
-                        if next_indent <= list_indent and not next_line.strip().startswith('>'):
-                            # Check if we need a blank line
-                            if not (i + 2 < len(lines) and is_list_item(lines[i + 2])):
-                                # Only add if next non-empty line isn't a list continuation
-                                pass  # We'll handle this in the next iteration
-                    elif not next_line.strip():
-                        # Blank line - might be end of list, but don't reset yet
-                        pass
-                else:
-                    # End of file - reset for next list
-                    current_list_indent_unit = None
-                    list_context_stack = []
-            else:
-                # Reset cache when list ends
-                if i + 1 < len(lines):
-                    next_line = lines[i + 1]
-                    if next_line.strip() and not is_list_item(next_line):
-                        current_list_indent_unit = None
-                        list_context_stack = []
-                    else:
-                        current_list_indent_unit = None
-                        list_context_stack = []
+            # Reset the indent unit cache and list context for the next list once this
+            # one ends: at end of file or before a non-blank, non-list line. (Blank
+            # lines after the list are handled when the next line is processed.) With
+            # rule 9 skipped they have always been reset after every item.
+            if (9 in skip_rules or i + 1 >= len(lines)
+                    or (lines[i + 1].strip() and line_kinds[i + 1] != 'list')):
+                current_list_indent_unit = None
+                list_context_stack = []
             i += 1
             continue
 
         # Handle blockquotes
-        if is_blockquote(line):
+        if line_kind == 'blockquote':
             # Clear list context when encountering a blockquote (non-list element)
             list_context_stack = []
             current_list_indent_unit = None
@@ -3169,12 +3427,14 @@ def process_file(filepath, wrap_width, overwrite=False, skip_rules=None, skip_st
             content = line[len(prefix):].lstrip()
 
             if 14 not in skip_rules:
-                if content and len(line.rstrip()) > wrap_width:
-                    wrapped = wrap_text(content, wrap_width, prefix + ' ')
-                    for j, wrapped_line in enumerate(wrapped):
-                        if j > 0:
-                            wrapped_line = prefix + ' ' + wrapped_line[len(prefix) + 1:]
-                        output.append(wrapped_line + '\n')
+                if content and _rstrip_len(line) > wrap_width:
+                    quote_prefix = prefix + ' '
+                    wrapped = wrap_text(content, wrap_width, quote_prefix)
+                    # Continuation lines get the quote prefix back in front of their text
+                    output.extend(
+                        (wrapped_line if j == 0 else quote_prefix + wrapped_line[len(quote_prefix):]) + '\n'
+                        for j, wrapped_line in enumerate(wrapped)
+                    )
                     changes_made = True
                 else:
                     output.append(line)
@@ -3187,14 +3447,14 @@ def process_file(filepath, wrap_width, overwrite=False, skip_rules=None, skip_st
         if stripped:
             # Clear list context when encountering paragraph text (non-list element)
             # But only if this is not indented (which would be part of a list item)
-            line_indent = len(line) - len(line.lstrip())
+            line_indent = _indent_len(line)
             if line_indent == 0 or not is_list_item(line):
                 list_context_stack = []
                 current_list_indent_unit = None
 
             # Ensure blank line before paragraph if previous was code block or list
-            if output and output[-1].strip():
-                prev = output[-1].strip()
+            prev = output[-1].strip() if output else ''
+            if prev:
                 if prev.startswith('```') or is_list_item(output[-1]):
                     output.append('\n')
                     changes_made = True
@@ -3208,10 +3468,9 @@ def process_file(filepath, wrap_width, overwrite=False, skip_rules=None, skip_st
 
             # Wrap if needed
             if 14 not in skip_rules:
-                if len(line.rstrip()) > wrap_width:
+                if _rstrip_len(line) > wrap_width:
                     wrapped = wrap_text(stripped, wrap_width)
-                    for wrapped_line in wrapped:
-                        output.append(wrapped_line + '\n')
+                    output.extend([wrapped_line + '\n' for wrapped_line in wrapped])
                     changes_made = True
                 else:
                     output.append(line)
@@ -3245,21 +3504,80 @@ def process_file(filepath, wrap_width, overwrite=False, skip_rules=None, skip_st
             output.append('\n')
             changes_made = True
 
+    return output, changes_made
+
+def process_content(text, wrap_width, skip_rules=None, skip_string=None, reverse_emphasis=False):
+    """Process markdown text held in memory
+
+    Args:
+        text: Markdown document as a string
+        wrap_width, skip_rules, skip_string, reverse_emphasis: As for process_file
+
+    Returns:
+        The processed document
+    """
+    normalized = text.replace('\r\n', '\n').replace('\r', '\n')
+    output, _ = _fix_lines(_split_lines(normalized), wrap_width, skip_rules, skip_string, reverse_emphasis,
+                           line_endings_changed=normalized != text)
+    return ''.join(output)
+
+def process_file(filepath, wrap_width, overwrite=False, skip_rules=None, skip_string=None, reverse_emphasis=False, writer=None):
+    """Process a single markdown file
+
+    Args:
+        filepath: Path to the markdown file
+        wrap_width: Width to wrap text at
+        overwrite: If True, overwrite the file. If False, output to STDOUT.
+        skip_rules: Set of rule numbers to skip
+        skip_string: Original skip string (for checking sub-keywords like em-dash, guillemet)
+        reverse_emphasis: If True, reverse emphasis markers (__ → ** for bold, * → _ for italic)
+        writer: Stream that receives the output when not overwriting (default: sys.stdout)
+
+    Returns:
+        True if changes were made, False otherwise
+    """
+    try:
+        with open(filepath, 'rb') as f:
+            data = f.read()
+        normalized_data = _normalize_newlines(data)
+        text = normalized_data.decode('utf-8')
+    except Exception as e:
+        print(f"Error reading {filepath}: {e}", file=sys.stderr)
+        return False
+    line_endings_changed = normalized_data != data
+    # When overwriting, a digest is enough to tell later whether the fixed
+    # text is any different; STDOUT output never needs it
+    original_digest = hashlib.blake2b(data, digest_size=16).digest() if overwrite else None
+
+    lines = _split_lines(text)
+    # Only the line list is used from here on; drop the raw and decoded
+    # copies of the file instead of holding them through every pass
+    del data, normalized_data, text
+
+    output, changes_made = _fix_lines(lines, wrap_width, skip_rules, skip_string, reverse_emphasis,
+                                      line_endings_changed=line_endings_changed)
+
     # Write output
     if overwrite:
         # Write back to file if changes were made
         if changes_made:
+            # Rules can report a change that nets out (e.g. a trailing blank
+            # line removed and re-added); leave such files untouched
+            result = ''.join(output).encode('utf-8')
+            if hashlib.blake2b(result, digest_size=16).digest() == original_digest:
+                return False
             try:
-                with open(filepath, 'w', encoding='utf-8', newline='\n') as f:
-                    f.writelines(output)
+                with open(filepath, 'wb') as f:
+                    # One buffer, one write call
+                    f.write(result)
                 return True
             except Exception as e:
                 print(f"Error writing {filepath}: {e}", file=sys.stderr)
                 return False
         return False
     else:
-        # Output to STDOUT
-        sys.stdout.writelines(output)
+        # Output to STDOUT (or the given stream) in one write
+        (writer or sys.stdout).write(''.join(output))
         return changes_made
 
 def get_config_path():
@@ -3294,9 +3612,6 @@ def init_config_file(force=False, local=False):
     Returns:
         Path to created config file, or None if not created
     """
-    if yaml is None:
-        return None
-
     if local:
         # Local config: .md-fixup in current directory
         config_file = Path('.md-fixup')
@@ -3307,6 +3622,13 @@ def init_config_file(force=False, local=False):
         config_dir, config_file = get_config_path()
         if config_file and not force:
             return None
+
+    # YAML is only imported once a config file is actually going to be written
+    yaml = _yaml_module()
+    if yaml is None:
+        return None
+
+    if not local:
         # Create config directory if it doesn't exist
         config_dir.mkdir(parents=True, exist_ok=True)
         config_file = config_dir / 'config.yml'
@@ -3336,68 +3658,41 @@ def _parse_config_rules(config):
     Returns:
         set of rule numbers to skip
     """
+    def items(key):
+        value = rules_config[key]
+        return value if isinstance(value, list) else [value]
+
+    def rules_named(item):
+        # Keywords first, then rule numbers (YAML gives ints or strings)
+        if isinstance(item, str):
+            rules = _KEYWORD_TO_RULES.get(item)
+            if rules is not None:
+                return rules
+        try:
+            rule_num = int(item)
+        except (TypeError, ValueError):
+            return ()
+        if rule_num in LINTING_RULES:
+            return (rule_num,)
+        return ()
+
     result = set()
     if 'rules' in config and isinstance(config['rules'], dict):
         rules_config = config['rules']
 
-        # Handle skip: all + include: [...] pattern
+        # Handle skip: all + include: [...] pattern (start with all rules disabled)
         if rules_config.get('skip') == 'all':
-            # Start with all rules disabled
-            all_rule_nums = set(LINTING_RULES.keys())
-            result = all_rule_nums.copy()
-
-            # Then include the specified rules
-            if 'include' in rules_config:
-                include_list = rules_config['include']
-                if not isinstance(include_list, list):
-                    include_list = [include_list]
-
-                for item in include_list:
-                    # Handle group keywords
-                    if item == 'code-block-newlines':
-                        result.discard(6)
-                        result.discard(7)
-                    elif item == 'display-math-newlines':
-                        result.discard(21)
-                    elif item in KEYWORD_TO_RULE:
-                        result.discard(KEYWORD_TO_RULE[item])
-                    elif item.isdigit() and int(item) in LINTING_RULES:
-                        result.discard(int(item))
+            result = set(LINTING_RULES.keys())
 
         # Handle simple skip: [...] pattern
         elif 'skip' in rules_config:
-            skip_list = rules_config['skip']
-            if not isinstance(skip_list, list):
-                skip_list = [skip_list]
-
-            for item in skip_list:
-                # Handle group keywords
-                if item == 'code-block-newlines':
-                    result.update({6, 7})
-                elif item == 'display-math-newlines':
-                    result.add(21)
-                elif item in KEYWORD_TO_RULE:
-                    result.add(KEYWORD_TO_RULE[item])
-                elif item.isdigit() and int(item) in LINTING_RULES:
-                    result.add(int(item))
-
-        # Handle include: [...] pattern (without skip: all)
-        if 'include' in rules_config and rules_config.get('skip') != 'all':
-            include_list = rules_config['include']
-            if not isinstance(include_list, list):
-                include_list = [include_list]
-
-            for item in include_list:
-                # Handle group keywords
-                if item == 'code-block-newlines':
-                    result.discard(6)
-                    result.discard(7)
-                elif item == 'display-math-newlines':
-                    result.discard(21)
-                elif item in KEYWORD_TO_RULE:
-                    result.discard(KEYWORD_TO_RULE[item])
-                elif item.isdigit() and int(item) in LINTING_RULES:
-                    result.discard(int(item))
+            for item in items('skip'):
+                result.update(rules_named(item))
+
+        # Handle include: [...] pattern, with or without skip: all
+        if 'include' in rules_config:
+            for item in items('include'):
+                result.difference_update(rules_named(item))
 
     return result
 
@@ -3409,15 +3704,15 @@ def load_config():
         Returns None if config file doesn't exist or YAML is not available
         Local config (.md-fixup) takes precedence over global config
     """
-    if yaml is None:
-        return None
-
     # Check for local config first (.md-fixup in current directory)
     local_config = Path('.md-fixup')
     if local_config.exists():
+        yaml = _yaml_module()
+        if yaml is None:
+            return None
         try:
             with open(local_config, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=_yaml_safe_loader(yaml))
             if config:
                 return {
                     'width': config.get('width'),
@@ -3433,9 +3728,14 @@ def load_config():
     if not config_file:
         return None
 
+    # YAML is only imported once there is a config file to read
+    yaml = _yaml_module()
+    if yaml is None:
+        return None
+
     try:
         with open(config_file, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=_yaml_safe_loader(yaml))
 
         if not config:
             return None
@@ -3449,6 +3749,52 @@ def load_config():
         # Silently ignore config file errors
         return None
 
+def _render_file(filepath, **options):
+    """Run process_file in STDOUT mode and return the text it would print"""
+    buffer = io.StringIO()
+    process_file(filepath, overwrite=False, writer=buffer, **options)
+    return buffer.getvalue()
+
+def _map_files(func, files):
+    """Apply func to each file, in worker processes for larger batches
+
+    Yields results in the order of files, each as soon as it is ready.
+    """
+    workers = os.cpu_count() or 1
+    # Worker processes only pay off when they can run side by side, and
+    # starting the pool costs more than a handful of files take to fix
+    if len(files) <= 4 or workers == 1:
+        yield from map(func, files)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(func, files, chunksize=max(1, len(files) // (4 * workers)))
+
+# Directories the default markdown search never descends into
+_SKIP_DIRS = frozenset({'vendor', 'build', '.git', 'node_modules'})
+
+def find_markdown_files(root='.'):
+    """Yield markdown files below root, skipping vendor, build and git directories
+
+    Excluded directories are pruned before they are read, rather than
+    walking them and filtering the results afterwards.
+    """
+    stack = ['']
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(os.path.join(root, directory)) as entries:
+                for entry in entries:
+                    path = os.path.join(directory, entry.name)
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in _SKIP_DIRS:
+                            stack.append(path)
+                    elif entry.name.endswith('.md') and entry.is_file():
+                        # is_file() follows symlinks, so linked files count but linked directories don't
+                        yield path
+        except OSError:
+            continue
+
 def main():
     """Main entry point"""
     rules_list = '\n'.join(f'  {num}. {desc[0]} ({desc[1]})' for num, desc in sorted(LINTING_RULES.items()))
@@ -3468,6 +3814,7 @@ Examples:
   %(prog)s --width 80 file1.md file2.md
   %(prog)s --width 72 *.md
   find . -name "*.md" | %(prog)s --width 100
+  find . -name "*.md" -print0 | %(prog)s --files0-from -
   %(prog)s  # Processes all .md files in current directory
   %(prog)s --skip 2,3 file.md  # Skip trailing whitespace and blank line collapse
   %(prog)s --skip wrap,end-newline file.md  # Skip wrapping and end newline (using keywords)
@@ -3512,6 +3859,11 @@ Examples:
         action='store_true',
         help='Reverse emphasis markers: use ** for bold and _ for italic (instead of __ for bold and * for italic)'
     )
+    parser.add_argument(
+        '--files0-from',
+        metavar='F',
+        help='Read NUL-separated file names from file F (use - for STDIN), e.g. the output of find -print0'
+    )
     parser.add_argument(
         'files',
         nargs='*',
@@ -3602,97 +3954,89 @@ Examples:
     # Also supports sub-keywords: em-dash, guillemet (for typography rule)
     # Note: skip_rules already contains config values, don't reset it
     if args.skip:
-        skip_values = [x.strip() for x in args.skip.split(',')]
-        for value in skip_values:
-            # Group keywords that map to multiple underlying rules
-            if value == 'code-block-newlines':
-                # Skip both before/after code block rules
-                skip_rules.update({6, 7})
-                continue
-            if value == 'display-math-newlines':
-                # Skip display math block spacing and surrounding newlines
-                skip_rules.add(21)
+        for value in (x.strip() for x in args.skip.split(',')):
+            # Keywords, including groups that map to multiple underlying rules
+            rules = _KEYWORD_TO_RULES.get(value)
+            if rules is not None:
+                skip_rules.update(rules)
                 continue
 
-            # Check for sub-keywords first (these don't map directly to rule numbers)
-            if value in ('em-dash', 'guillemet'):
+            # Sub-keywords don't map directly to rule numbers
+            if value in SKIP_SUB_KEYWORDS:
                 # These are handled separately in process_file via skip_string
                 continue
 
-            # Try to parse as number first
             try:
                 rule_num = int(value)
-                if rule_num not in LINTING_RULES:
-                    print(f"Error: Invalid rule number: {rule_num}", file=sys.stderr)
-                    print(f"Valid rule numbers are: {sorted(LINTING_RULES.keys())}", file=sys.stderr)
-                    sys.exit(1)
-                skip_rules.add(rule_num)
             except ValueError:
-                # Not a number, treat as keyword
-                if value in KEYWORD_TO_RULE:
-                    skip_rules.add(KEYWORD_TO_RULE[value])
-                else:
-                    print(f"Error: Invalid keyword: {value}", file=sys.stderr)
-                    valid_keywords = ', '.join(
-                        sorted(KEYWORD_TO_RULE.keys())
-                        + ['em-dash', 'guillemet', 'code-block-newlines', 'display-math-newlines', 'emphasis']
-                    )
-                    print(f"Valid keywords are: {valid_keywords}", file=sys.stderr)
-                    sys.exit(1)
+                print(f"Error: Invalid keyword: {value}", file=sys.stderr)
+                print(f"Valid keywords are: {_VALID_KEYWORDS_MSG}", file=sys.stderr)
+                sys.exit(1)
+            if rule_num not in LINTING_RULES:
+                print(f"Error: Invalid rule number: {rule_num}", file=sys.stderr)
+                print(f"Valid rule numbers are: {sorted(LINTING_RULES.keys())}", file=sys.stderr)
+                sys.exit(1)
+            skip_rules.add(rule_num)
+
+    # Add NUL-separated file names (handles any character a path can contain)
+    if args.files0_from:
+        if files:
+            parser.error('FILE arguments cannot be combined with --files0-from')
+        try:
+            if args.files0_from == '-':
+                file_list = sys.stdin.buffer.read()
+            else:
+                with open(args.files0_from, 'rb') as f:
+                    file_list = f.read()
+        except OSError as e:
+            print(f"Error reading {args.files0_from}: {e}", file=sys.stderr)
+            sys.exit(1)
+        files.extend(os.fsdecode(name) for name in file_list.split(b'\0') if name)
 
     # If no files provided as arguments, check STDIN
-    if not files and not sys.stdin.isatty():
-        # Read all STDIN content
-        stdin_content = sys.stdin.read()
-        stdin_lines = stdin_content.splitlines()
+    if not files and not args.files0_from and not sys.stdin.isatty():
+        # Only the first line is needed to decide how to treat STDIN
+        stdin_first = sys.stdin.readline()
 
-        if stdin_lines:
+        if stdin_first:
             # Check if first line looks like a file path (contains path separator or ends with .md)
-            first_line = stdin_lines[0].strip()
+            first_line = stdin_first.strip()
             looks_like_file_path = (
                 '/' in first_line or
                 '\\' in first_line or
                 first_line.endswith('.md') or
-                Path(first_line).exists()
+                # Longer lines can't be a path; stat() would fail with ENAMETOOLONG
+                (len(first_line) < 4096 and Path(first_line).exists())
             )
 
             if looks_like_file_path:
-                # Treat as file paths (one per line)
-                for line in stdin_lines:
+                # Treat as file paths (one per line), read as they arrive
+                if first_line:
+                    files.append(first_line)
+                for line in sys.stdin:
                     filepath = line.strip()
                     if filepath:
                         files.append(filepath)
             else:
-                # Treat as markdown content - process directly
-                import tempfile
-                with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as tmp:
-                    tmp.write(stdin_content)
-                    tmp_path = tmp.name
-
-                try:
-                    process_file(tmp_path, wrap_width, overwrite=False, skip_rules=skip_rules, skip_string=args.skip, reverse_emphasis=args.reverse_emphasis)
-                finally:
-                    os.unlink(tmp_path)
+                # Treat as markdown content - process directly (needs the whole document)
+                stdin_content = stdin_first + sys.stdin.read()
+                sys.stdout.write(process_content(stdin_content, wrap_width, skip_rules=skip_rules, skip_string=args.skip, reverse_emphasis=args.reverse_emphasis))
                 sys.exit(0)
 
-    # If still no files, find all markdown files
-    if not files:
-        root = Path('.')
-        for md_file in root.rglob('*.md'):
-            # Skip vendor, build, git directories
-            if any(part in str(md_file) for part in ['vendor', 'build', '.git', 'node_modules']):
-                continue
-            files.append(str(md_file))
+    # If still no files, find all markdown files (an empty --files0-from list means none)
+    if not files and not args.files0_from:
+        files.extend(find_markdown_files())
 
     if not files:
         print("No files to process.", file=sys.stderr)
         sys.exit(1)
 
+    files.sort()
+    options = dict(wrap_width=wrap_width, skip_rules=skip_rules, skip_string=args.skip, reverse_emphasis=args.reverse_emphasis)
+    # Files are fixed independently, so spread them over worker processes
     if overwrite:
-        changed_files = []
-        for filepath in sorted(files):
-            if process_file(filepath, wrap_width, overwrite=True, skip_rules=skip_rules, skip_string=args.skip, reverse_emphasis=args.reverse_emphasis):
-                changed_files.append(filepath)
+        results = _map_files(functools.partial(process_file, overwrite=True, **options), files)
+        changed_files = [filepath for filepath, changed in zip(files, results) if changed]
 
         if changed_files:
             print(f"Modified {len(changed_files)} file(s):")
@@ -3701,9 +4045,9 @@ Examples:
         else:
             print("No files needed changes.")
     else:
-        # Output to STDOUT - process all files sequentially
-        for filepath in sorted(files):
-            process_file(filepath, wrap_width, overwrite=False, skip_rules=skip_rules, skip_string=args.skip, reverse_emphasis=args.reverse_emphasis)
+        # Output to STDOUT, in file order
+        for rendered in _map_files(functools.partial(_render_file, **options), files):
+            sys.stdout.write(rendered)
 
 if __name__ == '__main__':
     main()
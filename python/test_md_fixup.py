@@ -3,16 +3,24 @@
 
 import unittest
 import tempfile
+import io
 import os
+import shutil
+import subprocess
+from contextlib import redirect_stdout
+from unittest import mock
 from pathlib import Path
 import sys
 
 # Import md-fixup as a module
 import importlib.util
-python_dir = Path(__file__).parent.parent / "python"
-spec = importlib.util.spec_from_file_location("md_fixup", python_dir / "md-fixup.py")
-md_fixup = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(md_fixup)
+# Reuse the module if another test file already loaded it
+md_fixup = sys.modules.get("md_fixup")
+if md_fixup is None:
+    spec = importlib.util.spec_from_file_location("md_fixup", Path(__file__).parent / "md-fixup.py")
+    md_fixup = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(md_fixup)
+    sys.modules["md_fixup"] = md_fixup
 
 
 class TestListNormalization(unittest.TestCase):
@@ -25,13 +33,7 @@ class TestListNormalization(unittest.TestCase):
         + Third level
             + Fourth level
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-            f.write(content)
-            f.flush()
-            md_fixup.process_file(f.name, 60, overwrite=True)
-            with open(f.name, 'r') as result:
-                output = result.read()
-            os.unlink(f.name)
+        output = md_fixup.process_content(content, 60)
 
         # Check that markers are normalized (spaces converted to tabs, linter adds blank line)
         self.assertIn("* First level", output)
@@ -45,13 +47,7 @@ class TestListNormalization(unittest.TestCase):
 3. Third
 5. Fifth
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-            f.write(content)
-            f.flush()
-            md_fixup.process_file(f.name, 60, overwrite=True)
-            with open(f.name, 'r') as result:
-                output = result.read()
-            os.unlink(f.name)
+        output = md_fixup.process_content(content, 60)
 
         # Check that renumbering happened (linter adds blank line at end)
         self.assertIn("1. First", output)
@@ -68,13 +64,7 @@ class TestListNormalization(unittest.TestCase):
 2. Second
     1. Another nested first
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-            f.write(content)
-            f.flush()
-            md_fixup.process_file(f.name, 60, overwrite=True)
-            with open(f.name, 'r') as result:
-                output = result.read()
-            os.unlink(f.name)
+        output = md_fixup.process_content(content, 60)
 
         # Check that nested lists are renumbered independently (linter adds blank line)
         self.assertIn("1. First", output)
@@ -92,13 +82,7 @@ class TestListNormalization(unittest.TestCase):
 2. Back to numbered
     - Different bullet marker
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-            f.write(content)
-            f.flush()
-            md_fixup.process_file(f.name, 60, overwrite=True)
-            with open(f.name, 'r') as result:
-                output = result.read()
-            os.unlink(f.name)
+        output = md_fixup.process_content(content, 60)
 
         # Check mixed list types work correctly (linter normalizes markers by level, adds blank line)
         self.assertIn("1. Numbered item", output)
@@ -115,13 +99,7 @@ class TestListNormalization(unittest.TestCase):
 3. Third
 * An interrupted list
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-            f.write(content)
-            f.flush()
-            md_fixup.process_file(f.name, 60, overwrite=True)
-            with open(f.name, 'r') as result:
-                output = result.read()
-            os.unlink(f.name)
+        output = md_fixup.process_content(content, 60)
 
         # Check interruption detection (linter adds blank line at end)
         self.assertIn("<!-- -->", output)
@@ -137,13 +115,7 @@ class TestListNormalization(unittest.TestCase):
 + Third bullet
 1. An interrupted numbered list
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-            f.write(content)
-            f.flush()
-            md_fixup.process_file(f.name, 60, overwrite=True)
-            with open(f.name, 'r') as result:
-                output = result.read()
-            os.unlink(f.name)
+        output = md_fixup.process_content(content, 60)
 
         # Check interruption detection (linter adds blank line at end)
         self.assertIn("<!-- -->", output)
@@ -153,38 +125,20 @@ class TestListNormalization(unittest.TestCase):
 class TestLiquidAndIalSpacing(unittest.TestCase):
     def test_liquid_tag_spacing(self):
         content = "Before {%tag%} after\n"
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-            f.write(content)
-            f.flush()
-            md_fixup.process_file(f.name, 60, overwrite=True)
-            with open(f.name, 'r') as result:
-                output = result.read()
-            os.unlink(f.name)
+        output = md_fixup.process_content(content, 60)
 
         self.assertIn("{% tag %}", output)
 
     def test_liquid_tag_spacing_preserves_code_span(self):
         content = "`{%tag%}` and {%tag%}\n"
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-            f.write(content)
-            f.flush()
-            md_fixup.process_file(f.name, 60, overwrite=True)
-            with open(f.name, 'r') as result:
-                output = result.read()
-            os.unlink(f.name)
+        output = md_fixup.process_content(content, 60)
 
         self.assertIn("`{%tag%}`", output)
         self.assertIn("{% tag %}", output)
 
     def test_kramdown_ial_trailing_space(self):
         content = "A {:.tip}\n"
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-            f.write(content)
-            f.flush()
-            md_fixup.process_file(f.name, 60, overwrite=True)
-            with open(f.name, 'r') as result:
-                output = result.read()
-            os.unlink(f.name)
+        output = md_fixup.process_content(content, 60)
 
         self.assertIn("A {: .tip }", output)
 
@@ -194,13 +148,7 @@ class TestLiquidAndIalSpacing(unittest.TestCase):
     * Nested bullet
 2. Second (should continue numbering)
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-            f.write(content)
-            f.flush()
-            md_fixup.process_file(f.name, 60, overwrite=True)
-            with open(f.name, 'r') as result:
-                output = result.read()
-            os.unlink(f.name)
+        output = md_fixup.process_content(content, 60)
 
         # Should NOT have HTML comment - different indentation levels (linter adds blank line)
         self.assertNotIn('<!-- -->', output)
@@ -217,13 +165,7 @@ class TestBoldItalicNormalization(unittest.TestCase):
         """Test that **bold** is normalized to __bold__"""
         content = """This is **bold** text.
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-            f.write(content)
-            f.flush()
-            md_fixup.process_file(f.name, 60, overwrite=True)
-            with open(f.name, 'r') as result:
-                output = result.read()
-            os.unlink(f.name)
+        output = md_fixup.process_content(content, 60)
 
         # Check that normalization happened (linter adds blank line at end)
         self.assertIn("__bold__", output)
@@ -233,13 +175,7 @@ class TestBoldItalicNormalization(unittest.TestCase):
         """Test that _italic_ is normalized to *italic*"""
         content = """This is _italic_ text.
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-            f.write(content)
-            f.flush()
-            md_fixup.process_file(f.name, 60, overwrite=True)
-            with open(f.name, 'r') as result:
-                output = result.read()
-            os.unlink(f.name)
+        output = md_fixup.process_content(content, 60)
 
         # Check that normalization happened (linter adds blank line at end)
         self.assertIn("*italic*", output)
@@ -249,13 +185,7 @@ class TestBoldItalicNormalization(unittest.TestCase):
         """Test nested bold and italic"""
         content = """***bold italic***
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-            f.write(content)
-            f.flush()
-            md_fixup.process_file(f.name, 60, overwrite=True)
-            with open(f.name, 'r') as result:
-                output = result.read()
-            os.unlink(f.name)
+        output = md_fixup.process_content(content, 60)
 
         # Should normalize to __*bold italic*__
         self.assertIn("__*bold italic*__", output)
@@ -271,13 +201,7 @@ _my_file_name.md starts with underscore.
 
 File _my_file_name.md ends with underscore.
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-            f.write(content)
-            f.flush()
-            md_fixup.process_file(f.name, 60, overwrite=True)
-            with open(f.name, 'r') as result:
-                output = result.read()
-            os.unlink(f.name)
+        output = md_fixup.process_content(content, 60)
 
         # Filenames should be preserved (not converted to emphasis)
         self.assertIn("_my_file_name.md", output)
@@ -291,13 +215,7 @@ File _my_file_name.md ends with underscore.
 
 _italic_ at start and __bold__ at start.
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-            f.write(content)
-            f.flush()
-            md_fixup.process_file(f.name, 60, overwrite=True)
-            with open(f.name, 'r') as result:
-                output = result.read()
-            os.unlink(f.name)
+        output = md_fixup.process_content(content, 60)
 
         # Normal emphasis should be converted
         self.assertIn("*italic*", output)
@@ -310,13 +228,7 @@ _italic_ at start and __bold__ at start.
 
 __bold__ text and __my_file_name.md should both appear.
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-            f.write(content)
-            f.flush()
-            md_fixup.process_file(f.name, 60, overwrite=True)
-            with open(f.name, 'r') as result:
-                output = result.read()
-            os.unlink(f.name)
+        output = md_fixup.process_content(content, 60)
 
         # Emphasis should be converted (may have spaces due to wrapping)
         # Check that _italic_ was converted (should not appear in output)
@@ -339,14 +251,8 @@ _This is a full-line phrase with an emphasis by surrounding underscores._
 
 _This is an emphasis_ by underscores at the beginning of a paragraph.
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-            f.write(content)
-            f.flush()
-            # Use wide wrap width to avoid wrapping affecting assertions
-            md_fixup.process_file(f.name, 120, overwrite=True)
-            with open(f.name, 'r') as result:
-                output = result.read()
-            os.unlink(f.name)
+        # Use wide wrap width to avoid wrapping affecting assertions
+        output = md_fixup.process_content(content, 120)
 
         # Should not have been rewritten into list items ("* " prefix)
         self.assertNotIn("* This is", output)
@@ -366,52 +272,44 @@ class TestBasicFunctionality(unittest.TestCase):
     def test_line_endings_normalization(self):
         """Test that line endings are normalized to Unix"""
         content = "Line 1\r\nLine 2\rLine 3\n"
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-            f.write(content)
-            f.flush()
-            md_fixup.process_file(f.name, 60, overwrite=True)
-            with open(f.name, 'rb') as result:
-                output = result.read()
-            os.unlink(f.name)
-
-        # Should only contain \n, no \r\n or \r
-        self.assertNotIn(b'\r\n', output)
+        # Goes through a real file so the bytes written back are checked
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / 'line_endings.md'
+            path.write_bytes(content.encode('utf-8'))
+            md_fixup.process_file(str(path), 60, overwrite=True)
+            output = path.read_bytes()
+
+        # Should only contain \n; no \r at all also rules out \r\n
         self.assertNotIn(b'\r', output)
         self.assertIn(b'\n', output)
 
     def test_trailing_whitespace_removal(self):
         """Test that trailing whitespace is removed"""
         content = "Line with spaces    \nLine with tabs\t\t\n"
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-            f.write(content)
-            f.flush()
-            md_fixup.process_file(f.name, 60, overwrite=True)
-            with open(f.name, 'r') as result:
-                output = result.read()
-            os.unlink(f.name)
+        output = md_fixup.process_content(content, 60)
 
         # Check that trailing whitespace is removed (except 2 spaces for line breaks)
-        lines = output.split('\n')
-        for line in lines[:-2]:  # Skip last blank line added by linter
-            if line and not line.endswith('  '):  # Allow 2 spaces for line breaks
-                self.assertFalse(line.rstrip() != line, f"Line has trailing whitespace: {repr(line)}")
+        # Allow 2 spaces for line breaks
+        offenders = [line for line in output.splitlines() if line and not line.endswith('  ') and line.rstrip() != line]
+        self.assertFalse(offenders, f"Lines have trailing whitespace: {offenders!r}")
 
     def test_end_newline(self):
         """Test that file ends with exactly one newline"""
         content = "Line 1\nLine 2"
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-            f.write(content)
-            f.flush()
-            md_fixup.process_file(f.name, 60, overwrite=True)
-            with open(f.name, 'r') as result:
-                output = result.read()
-            os.unlink(f.name)
+        output = md_fixup.process_content(content, 60)
 
         # Should end with exactly one newline (linter adds blank line + newline)
         self.assertTrue(output.endswith('\n'))
         # Should not end with multiple newlines (except the blank line rule)
         self.assertLessEqual(output.count('\n\n\n'), 0)
 
+    def test_typography_normalization(self):
+        """Test that curly quotes, dashes and ellipses are straightened"""
+        content = "\u201cDouble\u201d and \u2018single\u2019 \u2013 en \u2014 em\u2026\n"
+        output = md_fixup.process_content(content, 60)
+
+        self.assertIn("\"Double\" and 'single' -- en --- em...", output)
+
 
 class TestComplexScenarios(unittest.TestCase):
     """Test complex real-world scenarios"""
@@ -427,23 +325,24 @@ class TestComplexScenarios(unittest.TestCase):
 4. what?
 * An interrupted list
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-            f.write(content)
-            f.flush()
-            md_fixup.process_file(f.name, 60, overwrite=True)
-            with open(f.name, 'r') as result:
-                output = result.read()
-            os.unlink(f.name)
-
-        # Check key features (linter adds blank line at end)
-        self.assertIn("1. List item 1", output)
-        self.assertIn("2. Back to the root", output)
-        self.assertIn("3. what?", output)
-        self.assertIn("<!-- -->", output)
-        self.assertIn("* An interrupted list", output)
-        # Check nested items (spaces converted to tabs)
-        self.assertIn("1. Testing something", output)
-        self.assertIn("2. Else", output)
+        # Nested items use tabs and renumber, the marker change interrupts
+        # the list, and the linter adds a blank line at end
+        expected = """1. List item 1
+\t- indented item
+\t- another item
+\t\t1. Testing something
+\t\t2. Else
+2. Back to the root
+3. what?
+
+<!-- -->
+
+* An interrupted list
+
+"""
+        output = md_fixup.process_content(content, 60)
+
+        self.assertMultiLineEqual(output, expected)
 
 
 class TestWrapAfterLinkConversion(unittest.TestCase):
@@ -456,14 +355,8 @@ class TestWrapAfterLinkConversion(unittest.TestCase):
             "This is a [link](https://example.com/this/is/a/very/long/path/that/would/force/wrapping) in text.\n"
         )
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-            f.write(content)
-            f.flush()
-            # Rule 30 (inline-links) is disabled by default in the CLI; mirror that here.
-            md_fixup.process_file(f.name, 40, overwrite=True, skip_rules={30})
-            with open(f.name, 'r') as result:
-                output = result.read()
-            os.unlink(f.name)
+        # Rule 30 (inline-links) is disabled by default in the CLI; mirror that here.
+        output = md_fixup.process_content(content, 40, skip_rules={30})
 
         # Should have converted to reference-style
         self.assertIn("This is a [link][1] in text.", output)
@@ -473,5 +366,171 @@ class TestWrapAfterLinkConversion(unittest.TestCase):
         self.assertNotIn("](https://example.com/this/is/a/very/long/path/that/would/force/wrapping)", output)
 
 
+class TestConfig(unittest.TestCase):
+    """Test loading the local .md-fixup config file"""
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(tmpdir.name)
+
+    @unittest.skipIf(md_fixup._yaml_module() is None, "PyYAML is not installed")
+    def test_integer_rule_numbers(self):
+        """Test that rule numbers given as YAML integers are honored"""
+        Path('.md-fixup').write_text("width: 30\nrules:\n  skip: [3, wrap]\n", encoding='utf-8')
+        config = md_fixup.load_config()
+
+        self.assertIsNotNone(config)
+        self.assertEqual(config['width'], 30)
+        self.assertEqual(config['skip_rules'], {3, md_fixup.KEYWORD_TO_RULE['wrap']})
+
+
+class TestCommandLine(unittest.TestCase):
+    """Test the md-fixup command line in a scratch directory"""
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.tmpdir = Path(tmpdir.name)
+
+    def run_cli(self, *args, stdin=b''):
+        """Run md-fixup with args and return the completed process"""
+        # Point the global config at the scratch directory so user settings don't leak in
+        env = dict(os.environ, XDG_CONFIG_HOME=str(self.tmpdir / 'config'))
+        return subprocess.run(
+            [sys.executable, md_fixup.__file__, *args],
+            input=stdin, capture_output=True, cwd=self.tmpdir, env=env
+        )
+
+    def test_stdin_path_with_spaces(self):
+        """Test that a piped file name containing spaces is processed as a file"""
+        (self.tmpdir / 'my notes').write_text("# Notes\n", encoding='utf-8')
+        result = self.run_cli(stdin=b'my notes\n')
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout, b'# Notes\n\n')
+
+    def test_stdin_markdown_content(self):
+        """Test that piped text which names no file is processed as markdown"""
+        result = self.run_cli(stdin=b'hello world\n\n\n\n')
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout, b'hello world\n\n')
+
+    def write_files(self):
+        """Create two files whose names need NUL separation and return their names"""
+        names = ['a b.md', 'new\nline.md']
+        (self.tmpdir / names[0]).write_text("# A\n", encoding='utf-8')
+        (self.tmpdir / names[1]).write_text("# B\n", encoding='utf-8')
+        return names
+
+    def test_files0_from_stdin(self):
+        """Test NUL-separated names with spaces and newlines read from STDIN"""
+        names = self.write_files()
+        result = self.run_cli('--files0-from', '-', stdin='\0'.join(reversed(names)).encode())
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout, b'# A\n\n# B\n\n')
+
+    def test_files0_from_file_trailing_nul(self):
+        """Test a NUL-terminated list read from a file, as find -print0 writes it"""
+        names = self.write_files()
+        (self.tmpdir / 'list').write_bytes(b''.join(name.encode() + b'\0' for name in names))
+        result = self.run_cli('--files0-from', 'list')
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout, b'# A\n\n# B\n\n')
+
+    def test_files0_from_empty_list(self):
+        """Test that an empty list processes nothing instead of searching the directory"""
+        self.write_files()
+        result = self.run_cli('--files0-from', '-')
+
+        self.assertEqual(result.returncode, 1)
+        self.assertEqual(result.stdout, b'')
+        self.assertIn(b'No files to process.', result.stderr)
+
+    def test_files0_from_with_file_arguments(self):
+        """Test that --files0-from refuses positional FILE arguments"""
+        names = self.write_files()
+        result = self.run_cli('--files0-from', '-', names[0], stdin=names[1].encode())
+
+        self.assertEqual(result.returncode, 2)
+        self.assertEqual(result.stdout, b'')
+        self.assertIn(b'cannot be combined with --files0-from', result.stderr)
+
+
+class TestFindMarkdownFiles(unittest.TestCase):
+    """Test the default search for markdown files"""
+
+    def test_tree_walk(self):
+        """Test that excluded directories are pruned by exact name and symlinked directories aren't followed"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            for name in ['top.md', 'buildout.md', 'notes.txt', 'sub/nested/deep.md', 'folder.md/inner.md',
+                         '.github/template.md', 'rebuild/r.md', 'node_modules/pkg/readme.md',
+                         '.git/x.md', 'vendor/v.md', 'build/b.md']:
+                path = root / name
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text("# Title\n", encoding='utf-8')
+            try:
+                os.symlink('top.md', root / 'link.md')
+                os.symlink('sub', root / 'linkdir', target_is_directory=True)
+                os.symlink('sub', root / 'linkdir.md', target_is_directory=True)
+            except (OSError, NotImplementedError):
+                self.skipTest("symlinks are not supported here")
+
+            found = sorted(md_fixup.find_markdown_files(tmpdir))
+
+        expected = sorted(os.path.join(*name.split('/')) for name in [
+            'top.md', 'buildout.md', 'link.md', 'sub/nested/deep.md', 'folder.md/inner.md',
+            '.github/template.md', 'rebuild/r.md',
+        ])
+        self.assertEqual(found, expected)
+
+
+class TestMultipleFiles(unittest.TestCase):
+    """Test that a batch of files gives the same output with and without worker processes"""
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.tmpdir = Path(tmpdir.name)
+        # Workers that spawn instead of fork import the script by module name
+        shutil.copy(md_fixup.__file__, self.tmpdir / 'md_fixup.py')
+        sys.path.insert(0, str(self.tmpdir))
+        self.addCleanup(sys.path.remove, str(self.tmpdir))
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.tmpdir)
+        env = mock.patch.dict(os.environ, XDG_CONFIG_HOME=str(self.tmpdir / 'config'))
+        env.start()
+        self.addCleanup(env.stop)
+
+        self.contents = {f'doc{n}.md': f"# Doc {n}\n1. one\n3. two\n" for n in range(6)}
+        for name, content in self.contents.items():
+            (self.tmpdir / name).write_text(content, encoding='utf-8')
+
+    def run_main(self, cpu_count):
+        """Run main() on the files in reverse order with os.cpu_count patched"""
+        stdout = io.StringIO()
+        argv = ['md-fixup', *reversed(list(self.contents))]
+        with mock.patch.object(os, 'cpu_count', return_value=cpu_count), \
+                mock.patch.object(sys, 'argv', argv), redirect_stdout(stdout):
+            md_fixup.main()
+        return stdout.getvalue()
+
+    def test_in_process_and_pool_output_match(self):
+        """Test that files are printed in sorted order whether or not a pool is used"""
+        # Rule 30 (inline-links) is disabled by default in the CLI; mirror that here.
+        expected = ''.join(
+            md_fixup.process_content(self.contents[name], md_fixup.DEFAULT_WRAP_WIDTH, skip_rules={30})
+            for name in sorted(self.contents)
+        )
+
+        self.assertEqual(self.run_main(1), expected)
+        self.assertEqual(self.run_main(3), expected)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -2,17 +2,18 @@
 """Test that tables are not broken by wrapping"""
 
 import unittest
-import tempfile
-import os
 from pathlib import Path
 import sys
 
 # Import md-fixup as a module
 import importlib.util
-python_dir = Path(__file__).parent.parent / "python"
-spec = importlib.util.spec_from_file_location("md_fixup", python_dir / "md-fixup.py")
-md_fixup = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(md_fixup)
+# Reuse the module if another test file already loaded it
+md_fixup = sys.modules.get("md_fixup")
+if md_fixup is None:
+    spec = importlib.util.spec_from_file_location("md_fixup", Path(__file__).parent / "md-fixup.py")
+    md_fixup = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(md_fixup)
+    sys.modules["md_fixup"] = md_fixup
 
 
 class TestTableWrapping(unittest.TestCase):
@@ -24,18 +25,11 @@ class TestTableWrapping(unittest.TestCase):
 | --- | --- | --- |
 | Cell with very long content that should not wrap | Data | More data |
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-            f.write(content)
-            f.flush()
-            # Use narrow width to ensure wrapping would happen for regular text
-            md_fixup.process_file(f.name, 20, overwrite=True)
-            with open(f.name, 'r') as result:
-                output = result.read()
-            os.unlink(f.name)
+        # Use narrow width to ensure wrapping would happen for regular text
+        output = md_fixup.process_content(content, 20)
 
         # Table should be preserved - each row should be on a single line
-        lines = output.split('\n')
-        table_lines = [line for line in lines if '|' in line and line.strip()]
+        table_lines = [line for line in output.splitlines() if '|' in line and line.strip()]
 
         # All table lines should be single lines (not wrapped)
         for line in table_lines:
@@ -57,13 +51,7 @@ class TestTableWrapping(unittest.TestCase):
 
 This is a very long paragraph that should be wrapped when the width is narrow enough to trigger wrapping behavior.
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-            f.write(content)
-            f.flush()
-            md_fixup.process_file(f.name, 40, overwrite=True)
-            with open(f.name, 'r') as result:
-                output = result.read()
-            os.unlink(f.name)
+        output = md_fixup.process_content(content, 40)
 
         # Table should be intact (normalization may add spacing)
         self.assertIn("Header 1", output)
@@ -71,7 +59,7 @@ This is a very long paragraph that should be wrapped when the width is narrow en
         self.assertIn("Data 1", output)
         self.assertIn("Data 2", output)
         # Verify table structure is preserved (pipes present)
-        table_lines = [line for line in output.split('\n') if '|' in line and line.strip()]
+        table_lines = [line for line in output.splitlines() if '|' in line and line.strip()]
         self.assertGreaterEqual(len(table_lines), 3, "Should have at least header, separator, and data row")
 
         # Paragraph after table should be wrapped